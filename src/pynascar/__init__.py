@@ -1,9 +1,13 @@
 from .race import Race
 from .schedule import Schedule
 from .driver import Driver,DriversData
+from .career import CareerData
+from .dataset import load_dataset
+from .reprocess import reprocess, reprocess_races
 from .codes import FLAG_CODE
 from .utils import get_series_id, get_series_name
 from .config import get_settings, set_options
 from .core.base_api import NascarAPI, NASCARConfig
+from .core.async_api import AsyncNascarAPI
 
-__all__ = ["Race", "Schedule", "FLAG_CODE", "get_series_id", "get_series_name", "get_settings", "set_options",'Driver','DriversData','NascarAPI','NASCARConfig']
\ No newline at end of file
+__all__ = ["Race", "Schedule", "FLAG_CODE", "get_series_id", "get_series_name", "get_settings", "set_options",'Driver','DriversData','CareerData','load_dataset','reprocess','reprocess_races','NascarAPI','NASCARConfig','AsyncNascarAPI']
\ No newline at end of file
@@ -1,12 +1,35 @@
 # This file is all boilerplate for functionality. NOT written by me. Can/will update later if needed 
-# We are going with sqlite by default so we can use the same existing functions and just pass through the data
+# Every format goes through the same functions (save_df/load_df/...), sqlite included, so callers just pass the data
 # This should work for now
 
 from __future__ import annotations
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from pathlib import Path
+from urllib.parse import urlsplit
+import atexit
+import gzip
+import hashlib
+import io
+import json
+import os
 import re
+import sqlite3
+import struct
+import threading
+import time
 import pandas as pd
 from .config import get_settings
+from .core.schemas import apply_schema
+
+# csv/parquet write one file per table. bundle keeps every table of a race in one file (see _write_bundle),
+# schedules and driver frames are always single files so they use parquet in that mode.
+# sqlite keeps every frame (races, schedules, driver frames) in one database file (see _sql_write).
+# arrow writes Arrow IPC (feather v2) files that are memory mapped on read, see _read_arrow
+DF_FORMATS = ("parquet", "csv", "bundle", "sqlite", "arrow")
+_EXTENSIONS = {"parquet": ".parquet", "csv": ".csv", "arrow": ".arrow"}
+_FORMAT_ALIASES = {"feather": "arrow"}
 
 # Sanitize path segments and filenames
 def _sanitize(s: str) -> str:
@@ -17,33 +40,26 @@ def _seg(v) -> str:
         raise ValueError("year, series_id, and race_id must be provided")
     return _sanitize(str(v))
 
-def race_cache_dir(year, series_id, race_id) -> Path:
-    """
-    <cache_dir>/<year>/<series_id>/<race_id>
-    """
-    s = get_settings()
-    d = Path(s.cache_dir) / _seg(year) / _seg(series_id) / _seg(race_id)
-    d.mkdir(parents=True, exist_ok=True)
-    return d
+def _format(fmt: str | None = None) -> str:
+    fmt = (fmt or get_settings().df_format).lower()
+    return _FORMAT_ALIASES.get(fmt, fmt)
 
-def _cache_path(key: str, year, series_id, race_id, fmt: str | None = None) -> Path:
-    s = get_settings()
-    fmt = (fmt or s.df_format).lower()
-    ext = ".parquet" if fmt == "parquet" else ".csv"
-    return race_cache_dir(year, series_id, race_id) / f"{_sanitize(key)}{ext}"
+def cache_format(fmt: str | None = None) -> str:
+    """ Cache format fmt stands for, Settings.df_format when None ('feather' is 'arrow') """
+    return _format(fmt)
 
-def save_df(key: str, df: pd.DataFrame, *, year, series_id, race_id, fmt: str | None = None) -> Path:
-    """
-    Save: <cache_dir>/<year>/<series_id>/<race_id>/<key>.(csv|parquet)
-    """
-    if not isinstance(df, pd.DataFrame):
-        raise TypeError(f"save_df expects a pandas DataFrame; got {type(df).__name__}")
+def _file_format(fmt: str | None = None) -> str:
+    fmt = _format(fmt)
+    return "parquet" if fmt == "bundle" else fmt
+
+def _enabled() -> bool:
     s = get_settings()
-    path = _cache_path(key, year, series_id, race_id, fmt)
-    if not (s.cache_enabled and s.df_cache_enabled):
-        return path  # no-op but return target path
+    return s.cache_enabled and s.df_cache_enabled
 
-    fmt = (fmt or s.df_format).lower()
+def _write_frame(df: pd.DataFrame, path: Path, fmt: str) -> None:
+    if isinstance(path, Path):
+        # Cache directories are only created when something is written to them
+        path.parent.mkdir(parents=True, exist_ok=True)
     if fmt == "parquet":
         try:
             df.to_parquet(path, index=False)
@@ -53,54 +69,816 @@ def save_df(key: str, df: pd.DataFrame, *, year, series_id, race_id, fmt: str |
             ) from e
     elif fmt == "csv":
         df.to_csv(path, index=False)
+    elif fmt == "arrow":
+        _write_arrow(df, path)
     else:
-        raise ValueError("Unsupported format. Use 'csv' or 'parquet'.")
-    return path
+        raise ValueError(f"Unsupported format. Use one of {DF_FORMATS}.")
 
-def load_df(key: str, *, year, series_id, race_id, fmt: str | None = None) -> pd.DataFrame | None:
-    """
-    Load: <cache_dir>/<year>/<series_id>/<race_id>/<key>.(csv|parquet)
-    """
-    s = get_settings()
-    if not (s.cache_enabled and s.df_cache_enabled):
-        return None
-
-    path = _cache_path(key, year, series_id, race_id, fmt)
-    if not path.exists():
-        return None
-
-    fmt = (fmt or s.df_format).lower()
+def _read_frame(path: Path, fmt: str) -> pd.DataFrame:
     if fmt == "parquet":
         try:
             return pd.read_parquet(path)
+        except FileNotFoundError:
+            raise
         except Exception as e:
             raise RuntimeError("Failed to read parquet. Install 'pyarrow' or use 'csv'.") from e
     elif fmt == "csv":
         return pd.read_csv(path)
+    elif fmt == "arrow":
+        return _read_arrow(path)
     else:
-        raise ValueError("Unsupported format. Use 'csv' or 'parquet'.")
+        raise ValueError(f"Unsupported format. Use one of {DF_FORMATS}.")
+
+def _write_arrow(df: pd.DataFrame, path: Path) -> None:
+    """
+    Arrow IPC file, compressed per Settings.arrow_compression (uncompressed|lz4).
+    Written next to the target and moved over it, a process that has the old file mapped keeps reading the old data.
+    """
+    try:
+        import pyarrow as pa
+        from pyarrow import feather
+    except ImportError as e:
+        raise RuntimeError("Failed to write arrow. Install 'pyarrow' or set df_format='csv' via set_options().") from e
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    feather.write_feather(table, tmp, compression=get_settings().arrow_compression)
+    os.replace(tmp, path)
+
+def _read_arrow(path: Path) -> pd.DataFrame:
+    """
+    Memory mapped read. Uncompressed columns without nulls are used in place (no copy, and the pages are
+    shared by every process reading the file), the others are decoded. lz4 files are always decoded.
+    """
+    try:
+        from pyarrow import feather
+    except ImportError as e:
+        raise RuntimeError("Failed to read arrow. Install 'pyarrow' or use 'csv'.") from e
+    table = feather.read_table(path, memory_map=True)
+    return table.to_pandas(split_blocks=True)
+
+def race_cache_dir(year, series_id, race_id) -> Path:
+    """
+    <cache_dir>/<year>/<series_id>/<race_id>, only created once something is written to it
+    """
+    s = get_settings()
+    return Path(s.cache_dir) / _seg(year) / _seg(series_id) / _seg(race_id)
+
+def _cache_path(key: str, year, series_id, race_id, fmt: str | None = None) -> Path:
+    fmt = _format(fmt)
+    if fmt == "bundle":
+        return race_cache_dir(year, series_id, race_id) / BUNDLE_NAME
+    return race_cache_dir(year, series_id, race_id) / f"{_sanitize(key)}{_EXTENSIONS.get(fmt, '.csv')}"
+
+def race_frame_path(key: str, *, year, series_id, race_id, fmt: str | None = None) -> Path:
+    """ File holding table `key` of a race: <key>.<ext>, race.bundle in bundle format, the database in sqlite format """
+    if _format(fmt) == "sqlite":
+        return sqlite_path()
+    return _cache_path(key, year, series_id, race_id, fmt)
+
+# Race bundle: every table of a race in one file so a cache hit is a single open.
+#   MAGIC | parquet table 1 | parquet table 2 | ... | directory json | directory length (u64) | MAGIC
+# The directory maps key -> {"offset", "length", "rows"}, tables are read with one seek each.
+BUNDLE_NAME = "race.bundle"
+_BUNDLE_MAGIC = b"PYNBNDL1"
+_BUNDLE_TAIL = struct.Struct("<Q8s")
+
+def _read_bundle_directory(f) -> dict:
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    if size < len(_BUNDLE_MAGIC) + _BUNDLE_TAIL.size:
+        raise ValueError("Truncated bundle")
+    f.seek(size - _BUNDLE_TAIL.size)
+    dir_len, magic = _BUNDLE_TAIL.unpack(f.read(_BUNDLE_TAIL.size))
+    if magic != _BUNDLE_MAGIC:
+        raise ValueError("Not a pynascar bundle")
+    f.seek(size - _BUNDLE_TAIL.size - dir_len)
+    return json.loads(f.read(dir_len))
+
+def _read_bundle(path: Path, keys=None, raw: bool = False) -> dict:
+    """ {key: DataFrame} for keys in the bundle (all when keys is None). raw=True returns the parquet bytes """
+    try:
+        with open(path, "rb") as f:
+            directory = _read_bundle_directory(f)
+            wanted = directory if keys is None else [k for k in keys if k in directory]
+            out = {}
+            for key in wanted:
+                entry = directory[key]
+                f.seek(entry["offset"])
+                blob = f.read(entry["length"])
+                out[key] = blob if raw else pd.read_parquet(io.BytesIO(blob))
+            return out
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        raise RuntimeError(f"Failed to read race bundle {path}") from e
+
+def _write_bundle(path: Path, frames: dict, drop=()) -> None:
+    """ Add/replace `frames` in the bundle at path (tables already there are copied over as is) """
+    tables = {k: v for k, v in _read_bundle(path, raw=True).items() if k not in frames and k not in drop}
+    for key, df in frames.items():
+        buf = io.BytesIO()
+        _write_frame(df, buf, "parquet")
+        tables[key] = buf.getvalue()
+
+    out = io.BytesIO()
+    out.write(_BUNDLE_MAGIC)
+    directory = {}
+    for key, blob in tables.items():
+        directory[key] = {"offset": out.tell(), "length": len(blob)}
+        out.write(blob)
+    dir_bytes = json.dumps(directory).encode("utf-8")
+    out.write(dir_bytes)
+    out.write(_BUNDLE_TAIL.pack(len(dir_bytes), _BUNDLE_MAGIC))
+    _atomic_write(path, out.getvalue())
+
+# sqlite: every frame lives in <cache_dir>/pynascar.sqlite. A cache key is one SQL table (race_<key>,
+# schedule, drivers_<name>) with its key columns in front and an index on them, so cross race work is plain SQL
+# (see sql_query), e.g. SELECT race_id, AVG(lap_speed) FROM race_laps WHERE year = 2024 GROUP BY race_id
+# Race tables are keyed by year, series_id, race_id. Schedules and driver frames have their own year/series_id
+# columns so they are keyed by _year, _series_id.
+# _frames has one row per stored frame with its columns (tables only ever gain columns) and the ones kept as json.
+SQLITE_NAME = "pynascar.sqlite"
+_sql_local = threading.local()
+
+def sqlite_path() -> Path:
+    return Path(get_settings().cache_dir) / SQLITE_NAME
+
+def _sql_connect() -> sqlite3.Connection:
+    """ One connection per thread (and process, a forked worker does not reuse its parent's) and database """
+    if getattr(_sql_local, "pid", None) != os.getpid():
+        _sql_local.pid = os.getpid()
+        _sql_local.conns = {}
+    path = sqlite_path()
+    conn = _sql_local.conns.get(path)
+    if conn is None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Transactions are opened explicitly (see _sql_transaction)
+        conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        # Pages freed by deletes can be given back to the filesystem (see _sql_compact). Only takes effect
+        # on a new database, an existing one is converted by the VACUUM of gc()
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        # WAL so readers are not blocked by a writer (threads of CareerData, process workers)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # The WAL is cut back to this size after each checkpoint instead of staying at its largest
+        conn.execute("PRAGMA journal_size_limit=4194304")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS _frames (tbl TEXT NOT NULL, year INTEGER NOT NULL, series_id INTEGER NOT NULL,"
+            " race_id INTEGER NOT NULL, rows INTEGER, columns TEXT, json_columns TEXT,"
+            " PRIMARY KEY (tbl, year, series_id, race_id))"
+        )
+        _sql_local.conns[path] = conn
+    return conn
+
+@contextmanager
+def _sql_transaction():
+    """ Write transaction holding the database lock from the start, so the table checks of
+    _sql_write cannot race another writer creating the same table """
+    conn = _sql_connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+def _q(name) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+def _race_table(key: str) -> str:
+    return f"race_{_sanitize(key)}"
+
+def _race_keys(year, series_id, race_id) -> dict:
+    return {"year": int(year), "series_id": int(series_id), "race_id": int(race_id)}
+
+def _season_keys(year, series_id) -> dict:
+    return {"_year": int(year), "_series_id": int(series_id)}
+
+def _frame_id(table: str, keys: dict) -> tuple:
+    """ Primary key of the frame in _frames. Season frames have no race """
+    values = list(keys.values())
+    return (table, values[0], values[1], values[2] if len(values) > 2 else -1)
+
+def _sql_type(s: pd.Series) -> str:
+    if (pd.api.types.is_bool_dtype(s.dtype) or pd.api.types.is_integer_dtype(s.dtype)
+            or pd.api.types.is_timedelta64_dtype(s.dtype)):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(s.dtype):
+        return "REAL"
+    return "TEXT"
+
+def _sql_values(s: pd.Series) -> tuple[list, bool]:
+    """ Column as python values for sqlite and whether it was json encoded (lists/dicts) """
+    if pd.api.types.is_timedelta64_dtype(s.dtype):
+        # Nanoseconds, apply_schema turns them back into timedeltas
+        return s.astype("int64").astype(object).where(s.notna(), None).tolist(), False
+    if pd.api.types.is_datetime64_any_dtype(s.dtype):
+        return s.astype(str).where(s.notna(), None).tolist(), False
+    if s.dtype == object and s.map(lambda v: isinstance(v, (list, dict))).any():
+        return s.map(lambda v: json.dumps(v, default=str) if isinstance(v, (list, dict)) else v).tolist(), True
+    return s.astype(object).where(s.notna(), None).tolist(), False
+
+def _sql_columns(conn, table: str) -> dict:
+    """ {lower case name: name} of the table columns, sqlite names are case insensitive """
+    return {row[1].lower(): row[1] for row in conn.execute(f"PRAGMA table_info({_q(table)})")}
+
+def _where(keys: dict) -> str:
+    return " AND ".join(f"{_q(k)} = ?" for k in keys)
+
+def _sql_used_bytes(conn) -> int:
+    """ Bytes of the database pages in use (free pages left by deletes excluded) """
+    pages = conn.execute("PRAGMA page_count").fetchone()[0] - conn.execute("PRAGMA freelist_count").fetchone()[0]
+    return pages * conn.execute("PRAGMA page_size").fetchone()[0]
+
+def _sql_write(conn, table: str, keys: dict, df: pd.DataFrame) -> int:
+    """
+    Replace the rows of one frame. Runs inside the caller's transaction, which holds the write lock,
+    so the pages it takes on disk are measured as the pages in use after the insert less those after the delete.
+    """
+    if len(set(c.lower() for c in map(str, df.columns))) != len(df.columns):
+        raise ValueError(f"Columns of {table} must be unique (case insensitive) for sqlite")
+    clash = [c for c in df.columns if str(c).lower() in keys]
+    if clash:
+        raise ValueError(f"Columns {clash} of {table} clash with its sqlite key columns")
+    existing = _sql_columns(conn, table)
+    if not existing:
+        defs = [f"{_q(k)} INTEGER NOT NULL" for k in keys] + [f"{_q(c)} {_sql_type(df[c])}" for c in df.columns]
+        conn.execute(f"CREATE TABLE {_q(table)} ({', '.join(defs)})")
+        conn.execute(f"CREATE INDEX {_q('ix_' + table)} ON {_q(table)} ({', '.join(map(_q, keys))})")
+    else:
+        for c in df.columns:
+            if str(c).lower() not in existing:
+                conn.execute(f"ALTER TABLE {_q(table)} ADD COLUMN {_q(c)} {_sql_type(df[c])}")
+
+    values, json_columns = [], []
+    for c in df.columns:
+        column, is_json = _sql_values(df[c])
+        values.append(column)
+        if is_json:
+            json_columns.append(c)
+    conn.execute(f"DELETE FROM {_q(table)} WHERE {_where(keys)}", list(keys.values()))
+    before = _sql_used_bytes(conn)
+    if len(df):
+        names = list(keys) + [str(c) for c in df.columns]
+        key_values = [list(keys.values())] * len(df)
+        rows = ([*k, *v] for k, v in zip(key_values, zip(*values))) if values else key_values
+        conn.executemany(
+            f"INSERT INTO {_q(table)} ({', '.join(map(_q, names))}) VALUES ({', '.join('?' * len(names))})", rows
+        )
+    conn.execute(
+        "INSERT OR REPLACE INTO _frames VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [*_frame_id(table, keys), len(df), json.dumps([str(c) for c in df.columns]), json.dumps(json_columns)],
+    )
+    return max(0, _sql_used_bytes(conn) - before)
+
+def _sql_save(table_frames: dict, keys: dict) -> dict:
+    """ {table: df} of one race/season in a single transaction. Returns {table: bytes on disk} """
+    with _sql_transaction() as conn:
+        return {table: _sql_write(conn, table, keys, df) for table, df in table_frames.items()}
+
+def _sql_compact(vacuum: bool = False) -> None:
+    """
+    Give the pages freed by deletes back to the filesystem (a full VACUUM rebuilds the file) and
+    truncate the WAL, where deletes and VACUUM write first
+    """
+    conn = _sql_connect()
+    if vacuum:
+        conn.execute("VACUUM")
+    else:
+        # Frees one page per step, execute() would only run the first
+        conn.executescript("PRAGMA incremental_vacuum;")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+
+def _decode_json(df: pd.DataFrame, json_columns) -> pd.DataFrame:
+    for c in json_columns:
+        if c in df.columns:
+            df[c] = df[c].map(lambda v: json.loads(v) if isinstance(v, str) else v)
+    return df
+
+def _sql_read(table: str, keys: dict) -> pd.DataFrame | None:
+    if not sqlite_path().exists():
+        return None
+    conn = _sql_connect()
+    meta = conn.execute(
+        "SELECT columns, json_columns FROM _frames WHERE tbl = ? AND year = ? AND series_id = ? AND race_id = ?",
+        _frame_id(table, keys),
+    ).fetchone()
+    if meta is None:
+        return None
+    columns = json.loads(meta[0])
+    if not columns:
+        return pd.DataFrame()
+    df = pd.read_sql_query(
+        f"SELECT {', '.join(map(_q, columns))} FROM {_q(table)} WHERE {_where(keys)} ORDER BY rowid",
+        conn, params=list(keys.values()),
+    )
+    return _decode_json(df, json.loads(meta[1]))
+
+def _sql_tables(keys: dict) -> list:
+    """ Tables holding a frame for `keys` """
+    if not sqlite_path().exists():
+        return []
+    _, *frame = _frame_id("", keys)
+    rows = _sql_connect().execute(
+        "SELECT tbl FROM _frames WHERE year = ? AND series_id = ? AND race_id = ? ORDER BY tbl", frame
+    )
+    return [row[0] for row in rows]
+
+def _sql_delete(tables, keys: dict) -> bool:
+    tables = [t for t in tables if t in set(_sql_tables(keys))]
+    if not tables:
+        return False
+    with _sql_transaction() as conn:
+        for table in tables:
+            conn.execute(f"DELETE FROM {_q(table)} WHERE {_where(keys)}", list(keys.values()))
+            conn.execute("DELETE FROM _frames WHERE tbl = ? AND year = ? AND series_id = ? AND race_id = ?",
+                         _frame_id(table, keys))
+    return True
+
+def sql_frames(table: str) -> dict:
+    """ {(year, series_id, race_id): (columns, json columns)} of every frame stored in `table` """
+    if not sqlite_path().exists():
+        return {}
+    rows = _sql_connect().execute(
+        "SELECT year, series_id, race_id, columns, json_columns FROM _frames WHERE tbl = ?", (table,)
+    )
+    return {(y, s, r): (json.loads(c), json.loads(j)) for y, s, r, c, j in rows}
+
+def sql_read_table(key: str, races, columns=None) -> pd.DataFrame:
+    """
+    Rows of table `key` (race_<key>) of several races [(year, series_id, race_id), ...] in one query,
+    year, series_id and race_id first. columns: only select these (when stored), all by default.
+    """
+    table = _race_table(key)
+    frames = sql_frames(table)
+    races = {tuple(r) for r in races} & set(frames)
+    if not races:
+        return pd.DataFrame()
+    stored, json_columns = [], set()
+    for race in sorted(races):
+        cols, json_cols = frames[race]
+        stored += [c for c in cols if c not in stored]
+        json_columns.update(json_cols)
+    if columns is not None:
+        stored = [c for c in stored if c in columns]
+    years, series_ids = sorted({r[0] for r in races}), sorted({r[1] for r in races})
+    keys = ["year", "series_id", "race_id"]
+    query = (f"SELECT {', '.join(map(_q, keys + stored))} FROM {_q(table)}"
+             f" WHERE year IN ({', '.join('?' * len(years))}) AND series_id IN ({', '.join('?' * len(series_ids))})"
+             " ORDER BY year, series_id, race_id, rowid")
+    df = pd.read_sql_query(query, _sql_connect(), params=years + series_ids)
+    if len(races) < len(frames):
+        df = df[pd.MultiIndex.from_frame(df[keys]).isin(list(races))].reset_index(drop=True)
+    return _decode_json(df, json_columns)
+
+def sql_query(query: str, params=()) -> pd.DataFrame:
+    """
+    Run SQL against the sqlite cache (df_format="sqlite"), e.g.
+    sql_query("SELECT year, AVG(lap_speed) AS speed FROM race_laps WHERE series_id = ? GROUP BY year", (1,))
+    """
+    if not sqlite_path().exists():
+        raise FileNotFoundError(f"No sqlite cache at {sqlite_path()}. Use set_options(df_format='sqlite').")
+    return pd.read_sql_query(query, _sql_connect(), params=params)
+
+# In memory tier in front of the race frame reads (load_df/load_dfs). Frames are kept as read from disk
+# (schema applied) in least recently used order until their total size goes over
+# Settings.memory_cache_bytes. Callers get copies so the cached frame is never modified: shallow under
+# copy on write (always on in pandas 3), where any change copies the data first, deep otherwise.
+# save_dfs/clear_df/clear_race drop the frames they touch. The tier is per process, files changed by another
+# process are not noticed.
+def _copy_on_write() -> bool:
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    return pd.options.mode.copy_on_write is True
+
+def _isolated(df: pd.DataFrame) -> pd.DataFrame:
+    """ Copy of df whose changes never reach df """
+    return df.copy(deep=not _copy_on_write())
+
+class _MemoryCache:
+    def __init__(self):
+        self._frames = OrderedDict()  # key -> (DataFrame, bytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key) -> pd.DataFrame | None:
+        with self._lock:
+            entry = self._frames.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._frames.move_to_end(key)
+            self.hits += 1
+        return _isolated(entry[0])
+
+    def put(self, key, df: pd.DataFrame) -> None:
+        budget = get_settings().memory_cache_bytes
+        size = int(df.memory_usage(index=True, deep=True).sum())
+        if size > budget:
+            return
+        with self._lock:
+            self._pop(key)
+            self._frames[key] = (_isolated(df), size)
+            self._bytes += size
+            while self._bytes > budget:
+                self._pop(next(iter(self._frames)))
+
+    def _pop(self, key) -> None:
+        entry = self._frames.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def discard(self, match) -> None:
+        """ Drop every frame whose key satisfies match(key) """
+        with self._lock:
+            for key in [k for k in self._frames if match(k)]:
+                self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frames.clear()
+            self._bytes = 0
+            self.hits = self.misses = 0
+
+    def info(self) -> dict:
+        with self._lock:
+            return {"frames": len(self._frames), "bytes": self._bytes, "budget": get_settings().memory_cache_bytes,
+                    "hits": self.hits, "misses": self.misses}
+
+_memory = _MemoryCache()
+
+def _memory_race(year, series_id, race_id) -> tuple:
+    """ Race part of a memory key. The cache dir is part of it so set_options(cache_dir=...) never mixes caches """
+    return (str(get_settings().cache_dir), _seg(year), _seg(series_id), _seg(race_id))
+
+def _memory_key(key: str, year, series_id, race_id, fmt: str) -> tuple:
+    return (*_memory_race(year, series_id, race_id), fmt, key)
+
+def _forget(year, series_id, race_id, keys=None) -> None:
+    """ Drop the memory copies of a race, only `keys` when given """
+    race = _memory_race(year, series_id, race_id)
+    keys = None if keys is None else set(keys)
+    _memory.discard(lambda k: k[:4] == race and (keys is None or k[5] in keys))
+
+def clear_memory_cache() -> None:
+    """ Drop every frame held in memory (the files are left alone) """
+    _memory.clear()
+
+def memory_cache_info() -> dict:
+    """ {"frames", "bytes", "budget", "hits", "misses"} of the in memory tier """
+    return _memory.info()
+
+# Index of what the file formats hold: <cache_dir>/index.log, an append only log of json lines
+#   ["+" | "-", fmt, kind, entry, keys]   kind is race/schedule/drivers, entry "<year>/<series_id>[/<race_id>]"
+# ("-" with fmt "*" and keys null drops the whole entry). It is read once per process and then only its new
+# lines, so existence checks and listings are dict lookups: a miss costs one stat of the log to pick up what
+# other processes appended. Replaying a line twice is harmless, the log order decides.
+# Without a log (caches written before it) the disk is scanned once, rebuild_index() rescans on demand.
+# sqlite is not in the log, its _frames table already is an index.
+INDEX_NAME = "index.log"
+_FORMAT_OF_EXTENSION = {ext: fmt for fmt, ext in _EXTENSIONS.items()}
+
+def _race_entry_id(year, series_id, race_id) -> str:
+    return f"{_seg(year)}/{_seg(series_id)}/{_seg(race_id)}"
+
+def _season_entry_id(year, series_id) -> str:
+    return f"{_seg(year)}/{_seg(series_id)}"
+
+def _scan_index(root: Path) -> dict:
+    """ {(kind, entry): {fmt: set(keys)}} of the files on disk """
+    found = {}
+
+    def add(kind, entry, fmt, key):
+        found.setdefault((kind, entry), {}).setdefault(fmt, set()).add(key)
+
+    def scan(path):
+        try:
+            return list(os.scandir(path))
+        except OSError:
+            return []
+
+    for year in scan(root):
+        if not year.is_dir():
+            continue
+        if year.name.isdigit():
+            for series in scan(year.path):
+                for race in scan(series.path):
+                    entry = f"{year.name}/{series.name}/{race.name}"
+                    for f in scan(race.path):
+                        stem, dot, ext = f.name.rpartition(".")
+                        if f.name == BUNDLE_NAME:
+                            try:
+                                with open(f.path, "rb") as fh:
+                                    for key in _read_bundle_directory(fh):
+                                        add("race", entry, "bundle", key)
+                            except (OSError, ValueError):
+                                pass
+                        elif dot and not f.name.startswith(".") and "." + ext in _FORMAT_OF_EXTENSION:
+                            add("race", entry, _FORMAT_OF_EXTENSION["." + ext], stem)
+        elif year.name in ("schedule", "drivers"):
+            for season in scan(year.path):
+                for f in scan(season.path):
+                    stem, dot, ext = f.name.rpartition(".")
+                    if not dot or f.name.startswith(".") or "." + ext not in _FORMAT_OF_EXTENSION:
+                        continue
+                    fmt = _FORMAT_OF_EXTENSION["." + ext]
+                    if year.name == "schedule":
+                        add("schedule", f"{season.name}/{stem}", fmt, "schedule")
+                    elif "_" in stem:
+                        series_id, name = stem.split("_", 1)
+                        add("drivers", f"{season.name}/{series_id}", fmt, name)
+    return found
+
+
+class _CacheIndex:
+    def __init__(self, root: Path):
+        self.root = root
+        self.path = root / INDEX_NAME
+        self.entries = {}  # (kind, entry) -> {fmt: set(keys)}
+        self._offset = 0
+        self._inode = None
+        self._lock = threading.RLock()
+        if not self.refresh() and root.exists():
+            self.rebuild()
+
+    def _apply(self, op, fmt, kind, entry, keys) -> None:
+        formats = self.entries.get((kind, entry))
+        if op == "+":
+            if formats is None:
+                formats = self.entries[(kind, entry)] = {}
+            formats.setdefault(fmt, set()).update(keys)
+            return
+        if formats is None:
+            return
+        if fmt == "*":
+            self.entries.pop((kind, entry), None)
+            return
+        if keys is None:
+            formats.pop(fmt, None)
+        elif fmt in formats:
+            formats[fmt].difference_update(keys)
+            if not formats[fmt]:
+                formats.pop(fmt)
+        if not formats:
+            self.entries.pop((kind, entry), None)
+
+    def refresh(self) -> bool:
+        """ Apply what was appended since the last read (everything after a rebuild). False without a log """
+        with self._lock:
+            try:
+                st = os.stat(self.path)
+            except OSError:
+                return False
+            if st.st_ino != self._inode or st.st_size < self._offset:
+                # New or rewritten log, read it from the start
+                self.entries, self._offset, self._inode = {}, 0, st.st_ino
+            if st.st_size == self._offset:
+                return True
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                data = f.read(st.st_size - self._offset)
+            # A line still being appended by another process is left for the next refresh
+            end = data.rfind(b"\n") + 1
+            for line in data[:end].splitlines():
+                try:
+                    self._apply(*json.loads(line))
+                except (ValueError, TypeError):
+                    continue
+            self._offset += end
+            return True
+
+    def record(self, op: str, fmt: str, kind: str, entry: str, keys) -> None:
+        keys = None if keys is None else sorted(keys)
+        line = (json.dumps([op, fmt, kind, entry, keys]) + "\n").encode("utf-8")
+        with self._lock:
+            self._apply(op, fmt, kind, entry, keys or ())
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "ab") as f:
+                f.write(line)
+
+    def keys(self, kind: str, entry: str, fmt: str) -> set:
+        with self._lock:
+            return set(self.entries.get((kind, entry), {}).get(fmt, ()))
+
+    def has(self, kind: str, entry: str, fmt: str, key: str) -> bool:
+        if key in self.entries.get((kind, entry), {}).get(fmt, ()):
+            return True
+        self.refresh()
+        return key in self.entries.get((kind, entry), {}).get(fmt, ())
+
+    def rebuild(self) -> None:
+        """ Replace the log with a snapshot of the disk """
+        with self._lock:
+            found = _scan_index(self.root)
+            self.entries = found
+            if not found and not self.path.exists():
+                return  # nothing cached, nothing to write
+            lines = [json.dumps(["+", fmt, kind, entry, sorted(keys)])
+                     for (kind, entry), formats in sorted(found.items()) for fmt, keys in sorted(formats.items())]
+            data = "".join(line + "\n" for line in lines).encode("utf-8")
+            _atomic_write(self.path, data)
+            st = os.stat(self.path)
+            self._offset, self._inode = st.st_size, st.st_ino
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def _index() -> _CacheIndex:
+    root = Path(get_settings().cache_dir)
+    key = (str(root), os.getpid())
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = _CacheIndex(root)
+        return index
+
+def rebuild_index() -> None:
+    """ Rescan the cache dir into index.log, for files written or deleted without going through this module """
+    _index().rebuild()
+
+def list_cached_races(year=None, series_id=None, key: str | None = None, fmt: str | None = None) -> list:
+    """
+    Sorted (year, series_id, race_id) of the cached races, optionally of one year/series or only the ones
+    holding table `key`. Answered from the cache index (or the sqlite _frames table) in one read.
+    """
+    fmt = _format(fmt)
+    if fmt == "sqlite":
+        if not sqlite_path().exists():
+            return []
+        query = "SELECT DISTINCT year, series_id, race_id FROM _frames WHERE tbl LIKE 'race\\_%' ESCAPE '\\'"
+        params = []
+        if key is not None:
+            query, params = "SELECT year, series_id, race_id FROM _frames WHERE tbl = ?", [_race_table(key)]
+        races = {tuple(r) for r in _sql_connect().execute(query, params)}
+    else:
+        index = _index()
+        index.refresh()
+        with index._lock:
+            races = set()
+            for (kind, entry), formats in index.entries.items():
+                if kind == "race" and fmt in formats and (key is None or key in formats[fmt]):
+                    parts = entry.split("/")
+                    if all(p.isdigit() for p in parts):
+                        races.add(tuple(int(p) for p in parts))
+    return sorted(r for r in races if (year is None or r[0] == int(year))
+                  and (series_id is None or r[1] == int(series_id)))
+
+def save_df(key: str, df: pd.DataFrame, *, year, series_id, race_id, fmt: str | None = None) -> Path:
+    """
+    Save: <cache_dir>/<year>/<series_id>/<race_id>/<key>.(csv|parquet) or into race.bundle
+    """
+    return save_dfs({key: df}, year=year, series_id=series_id, race_id=race_id, fmt=fmt)
+
+def save_dfs(frames: dict, *, year, series_id, race_id, fmt: str | None = None) -> Path:
+    """
+    Save several tables of one race. In bundle format they are written with a single rewrite of race.bundle,
+    in sqlite format in one transaction.
+    Returns the race cache directory (the database file for sqlite).
+    """
+    for key, df in frames.items():
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError(f"save_df expects a pandas DataFrame; got {type(df).__name__} for {key}")
+    fmt = _format(fmt)
+    _forget(year, series_id, race_id, frames)
+    if fmt == "sqlite":
+        if not _enabled() or not frames:
+            return sqlite_path()
+        tables = {_race_table(k): df for k, df in frames.items()}
+        sizes = _sql_save(tables, _race_keys(year, series_id, race_id))
+        _ledger_touch(_race_entry(year, series_id, race_id), sql=sizes)
+        return sqlite_path()
+    d = race_cache_dir(year, series_id, race_id)
+    if not _enabled() or not frames:
+        return d  # no-op but return target path
+
+    if fmt == "bundle":
+        _write_bundle(d / BUNDLE_NAME, frames)
+    else:
+        for key, df in frames.items():
+            _write_frame(df, _cache_path(key, year, series_id, race_id, fmt), fmt)
+    _index().record("+", fmt, "race", _race_entry_id(year, series_id, race_id), frames)
+    _ledger_touch(_race_entry(year, series_id, race_id), files=_race_files_bytes(year, series_id, race_id))
+    return d
+
+def load_df(key: str, *, year, series_id, race_id, fmt: str | None = None) -> pd.DataFrame | None:
+    """
+    Load: <cache_dir>/<year>/<series_id>/<race_id>/<key>.(csv|parquet) or from race.bundle
+    """
+    return load_dfs([key], year=year, series_id=series_id, race_id=race_id, fmt=fmt).get(key)
+
+def load_dfs(keys, *, year, series_id, race_id, fmt: str | None = None) -> dict:
+    """
+    Load several tables of one race, {key: DataFrame} for the ones that are cached.
+    In bundle format this is one open of race.bundle whatever the number of keys.
+    Frames come back with the dtypes of their schema (core.schemas).
+    Frames read before are served from memory when Settings.memory_cache_bytes allows it (see _MemoryCache).
+    """
+    if not _enabled():
+        return {}
+    fmt = _format(fmt)
+    use_memory = get_settings().memory_cache_bytes > 0
+    found = {}
+    if use_memory:
+        for key in keys:
+            df = _memory.get(_memory_key(key, year, series_id, race_id, fmt))
+            if df is not None:
+                found[key] = df
+    missing = [key for key in keys if key not in found]
+    if not missing:
+        _ledger_touch(_race_entry(year, series_id, race_id))
+        return found
+
+    if fmt == "sqlite":
+        race = _race_keys(year, series_id, race_id)
+        out = {key: _sql_read(_race_table(key), race) for key in missing}
+        out = {key: df for key, df in out.items() if df is not None}
+    else:
+        # Only keys the index knows about are opened
+        index, entry = _index(), _race_entry_id(year, series_id, race_id)
+        missing = [key for key in missing if index.has("race", entry, fmt, key)]
+        out = {}
+        if fmt == "bundle" and missing:
+            out = _read_bundle(_cache_path("", year, series_id, race_id, fmt), missing)
+        elif fmt != "bundle":
+            for key in missing:
+                try:
+                    out[key] = _read_frame(_cache_path(key, year, series_id, race_id, fmt), fmt)
+                except FileNotFoundError:
+                    pass
+        gone = [key for key in missing if key not in out]
+        if gone:
+            # Deleted behind our back
+            index.record("-", fmt, "race", entry, gone)
+    for key, df in out.items():
+        df = apply_schema(df, key)
+        if use_memory:
+            _memory.put(_memory_key(key, year, series_id, race_id, fmt), df)
+            df = df.copy(deep=False)
+        found[key] = df
+    if found:
+        _ledger_touch(_race_entry(year, series_id, race_id))
+    return {key: found[key] for key in keys if key in found}
+
+def list_dfs(*, year, series_id, race_id, fmt: str | None = None) -> list:
+    """ Keys cached for a race """
+    fmt = _format(fmt)
+    if fmt == "sqlite":
+        return [t[len("race_"):] for t in _sql_tables(_race_keys(year, series_id, race_id)) if t.startswith("race_")]
+    index = _index()
+    index.refresh()
+    return sorted(index.keys("race", _race_entry_id(year, series_id, race_id), fmt))
 
 def has_df(key: str, *, year, series_id, race_id, fmt: str | None = None) -> bool:
-    return _cache_path(key, year, series_id, race_id, fmt).exists()
+    fmt = _format(fmt)
+    if fmt == "sqlite":
+        return _race_table(key) in _sql_tables(_race_keys(year, series_id, race_id))
+    return _index().has("race", _race_entry_id(year, series_id, race_id), fmt, key)
 
 def clear_df(key: str, *, year, series_id, race_id, fmt: str | None = None) -> bool:
+    _forget(year, series_id, race_id, [key])
+    entry = _race_entry(year, series_id, race_id)
+    if _format(fmt) == "sqlite":
+        _ledger_touch(entry, drop_sql=(_race_table(key),), access=False)
+        return _sql_delete([_race_table(key)], _race_keys(year, series_id, race_id))
+    if _format(fmt) == "bundle":
+        if not has_df(key, year=year, series_id=series_id, race_id=race_id, fmt=fmt):
+            return False
+        _write_bundle(_cache_path(key, year, series_id, race_id, fmt), {}, drop=(key,))
+        _index().record("-", "bundle", "race", _race_entry_id(year, series_id, race_id), [key])
+        _ledger_touch(entry, files=_race_files_bytes(year, series_id, race_id), access=False)
+        return True
     p = _cache_path(key, year, series_id, race_id, fmt)
     if p.exists():
         p.unlink(missing_ok=True)
+        _index().record("-", _format(fmt), "race", _race_entry_id(year, series_id, race_id), [key])
+        _ledger_touch(entry, files=_race_files_bytes(year, series_id, race_id), access=False)
         return True
     return False
 
 def clear_race(year, series_id, race_id) -> bool:
     """
-    Delete <cache_dir>/<year>/<series_id>/<race_id> and prune empty parents.
+    Delete <cache_dir>/<year>/<series_id>/<race_id> (raw payloads included) and prune empty parents.
+    Frames of the race in the sqlite cache and in memory are deleted as well.
     """
+    _forget(year, series_id, race_id)
+    _ledger_drop(_race_entry(year, series_id, race_id))
+    race = _race_keys(year, series_id, race_id)
+    removed = _sql_delete(_sql_tables(race), race)
     d = race_cache_dir(year, series_id, race_id)
-    removed = False
     if d.exists():
-        for p in d.glob("*"):
+        _index().record("-", "*", "race", _race_entry_id(year, series_id, race_id), None)
+        for p in [*d.glob("*"), *(d / RAW_DIR).glob("*")]:
             if p.is_file():
                 p.unlink(missing_ok=True)
                 removed = True
+        try:
+            (d / RAW_DIR).rmdir()
+        except OSError:
+            pass
         try:
             d.rmdir()
         except OSError:
@@ -115,141 +893,675 @@ def clear_race(year, series_id, race_id) -> bool:
             parent = parent.parent
     return removed
 
+MANIFEST_NAME = "manifest.json"
+
+def _manifest_path(year, series_id, race_id) -> Path:
+    return race_cache_dir(year, series_id, race_id) / MANIFEST_NAME
+
+def load_manifest(*, year, series_id, race_id) -> dict | None:
+    """
+    Load: <cache_dir>/<year>/<series_id>/<race_id>/manifest.json
+    {"frames": {key: {"written_at", "rows", **stamp}}, "endpoints": {endpoint: {"fetched_at", "frames", **stamp}},
+     "metadata": {...}}
+    stamp is the processor/schema version and payload hash the frames were derived with, see race.endpoint_stamp
+    """
+    s = get_settings()
+    if not (s.cache_enabled and s.df_cache_enabled):
+        return None
+    path = _manifest_path(year, series_id, race_id)
+    try:
+        return json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+def payload_digest(payload) -> str:
+    """ sha256 of a decoded JSON payload, the same whatever the key order or whitespace of the response """
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+def record_race_endpoint(endpoint: str, frames: dict, *, year, series_id, race_id, metadata: dict | None = None,
+                         stamp: dict | None = None) -> dict | None:
+    """
+    Mark `endpoint` as fully cached for a race. frames is {key: row count} of what it wrote,
+    keys of the endpoint that are not listed are known to be empty.
+    stamp ({"processor_version", "schema_version", "payload_sha256"}) is stored on the endpoint and each frame.
+    """
+    s = get_settings()
+    if not (s.cache_enabled and s.df_cache_enabled):
+        return None
+    manifest = load_manifest(year=year, series_id=series_id, race_id=race_id) or {}
+    manifest.setdefault("frames", {})
+    manifest.setdefault("endpoints", {})
+    now = datetime.now(timezone.utc).isoformat()
+    for key, rows in frames.items():
+        manifest["frames"][key] = {"written_at": now, "rows": int(rows), **(stamp or {})}
+    manifest["endpoints"][endpoint] = {"fetched_at": now, "frames": sorted(frames), **(stamp or {})}
+    if metadata is not None:
+        manifest["metadata"] = metadata
+    _atomic_write(_manifest_path(year, series_id, race_id), json.dumps(manifest, default=str).encode("utf-8"))
+    _ledger_touch(_race_entry(year, series_id, race_id), files=_race_files_bytes(year, series_id, race_id))
+    return manifest
+
+def race_cache_complete(endpoints, *, year, series_id, race_id) -> bool:
+    """ True when the manifest has every one of `endpoints` """
+    manifest = load_manifest(year=year, series_id=series_id, race_id=race_id) or {}
+    return all(e in manifest.get("endpoints", {}) for e in endpoints)
+
+# Raw endpoint payloads, gzip compressed JSON in <race dir>/raw whatever the df format, so the frames
+# can be derived again without the network (Race.reprocess). Only written with Settings.raw_cache_enabled.
+# They belong to the race entry of the ledger and go with clear_race.
+RAW_DIR = "raw"
+
+def _raw_path(endpoint: str, year, series_id, race_id) -> Path:
+    return race_cache_dir(year, series_id, race_id) / RAW_DIR / f"{_sanitize(endpoint)}.json.gz"
+
+def save_raw_payload(endpoint: str, payload, *, year, series_id, race_id) -> Path | None:
+    """
+    Save: <cache_dir>/<year>/<series_id>/<race_id>/raw/<endpoint>.json.gz
+    """
+    s = get_settings()
+    if not (s.cache_enabled and s.raw_cache_enabled):
+        return None
+    path = _raw_path(endpoint, year, series_id, race_id)
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    _atomic_write(path, gzip.compress(body, compresslevel=6))
+    _ledger_touch(_race_entry(year, series_id, race_id), files=_race_files_bytes(year, series_id, race_id))
+    return path
+
+def load_raw_payload(endpoint: str, *, year, series_id, race_id):
+    """ Payload saved by save_raw_payload, None if there is none. Read even when raw_cache_enabled is off """
+    if not get_settings().cache_enabled:
+        return None
+    try:
+        return json.loads(gzip.decompress(_raw_path(endpoint, year, series_id, race_id).read_bytes()))
+    except (OSError, EOFError, ValueError):
+        return None
+
+def list_raw_races(year=None, series_id=None) -> list:
+    """ Sorted (year, series_id, race_id) of every race with stored raw payloads """
+    root = Path(get_settings().cache_dir)
+    races = []
+    for raw in root.glob(f"{_seg(year) if year is not None else '*'}/{_seg(series_id) if series_id is not None else '*'}/*/{RAW_DIR}"):
+        parts = raw.relative_to(root).parts[:3]
+        if all(p.isdigit() for p in parts) and any(raw.glob("*.json.gz")):
+            races.append(tuple(int(p) for p in parts))
+    return sorted(races)
+
 def schedule_cache_dir(year) -> Path:
     """
-    <cache_dir>/schedule/<year>
+    <cache_dir>/schedule/<year>, only created once something is written to it
     """
     s = get_settings()
-    d = Path(s.cache_dir) / "schedule" / _seg(year)
-    d.mkdir(parents=True, exist_ok=True)
-    return d
+    return Path(s.cache_dir) / "schedule" / _seg(year)
 
 def _schedule_cache_path(year, series_id, fmt: str | None = None) -> Path:
-    s = get_settings()
-    fmt = (fmt or s.df_format).lower()
-    ext = ".parquet" if fmt == "parquet" else ".csv"
+    ext = _EXTENSIONS.get(_file_format(fmt), ".csv")
     return schedule_cache_dir(year) / f"{_sanitize(str(series_id))}{ext}"
 
 def save_schedule(df: pd.DataFrame, *, year, series_id, fmt: str | None = None) -> Path:
     """
-    Save: <cache_dir>/schedule/<year>/<series_id>.(csv|parquet)
+    Save: <cache_dir>/schedule/<year>/<series_id>.(csv|parquet) or the schedule table in sqlite format
     """
     if not isinstance(df, pd.DataFrame):
         raise TypeError(f"save_schedule expects a pandas DataFrame; got {type(df).__name__}")
-    s = get_settings()
+    entry = _schedule_entry(year, series_id)
+    if _format(fmt) == "sqlite":
+        if not _enabled():
+            return sqlite_path()
+        _ledger_touch(entry, sql=_sql_save({"schedule": df}, _season_keys(year, series_id)))
+        return sqlite_path()
     path = _schedule_cache_path(year, series_id, fmt)
-    if not (s.cache_enabled and s.df_cache_enabled):
+    if not _enabled():
         return path  # no-op
-
-    fmt = (fmt or s.df_format).lower()
-    if fmt == "parquet":
-        try:
-            df.to_parquet(path, index=False)
-        except Exception as e:
-            raise RuntimeError("Failed to write parquet. Install 'pyarrow' or set df_format='csv'.") from e
-    elif fmt == "csv":
-        df.to_csv(path, index=False)
-    else:
-        raise ValueError("Unsupported format. Use 'csv' or 'parquet'.")
+    _write_frame(df, path, _file_format(fmt))
+    _index().record("+", _file_format(fmt), "schedule", _season_entry_id(year, series_id), ["schedule"])
+    _ledger_touch(entry, files=_files_bytes(_season_files("schedule", year, series_id)))
     return path
 
 def load_schedule(*, year, series_id, fmt: str | None = None) -> pd.DataFrame | None:
     """
     Load: <cache_dir>/schedule/<year>/<series_id>.(csv|parquet)
     """
-    s = get_settings()
-    if not (s.cache_enabled and s.df_cache_enabled):
+    if not _enabled():
         return None
-
-    path = _schedule_cache_path(year, series_id, fmt)
-    if not path.exists():
-        return None
-
-    fmt = (fmt or s.df_format).lower()
-    if fmt == "parquet":
-        try:
-            return pd.read_parquet(path)
-        except Exception as e:
-            raise RuntimeError("Failed to read parquet. Install 'pyarrow' or use 'csv'.") from e
-    elif fmt == "csv":
-        return pd.read_csv(path)
+    if _format(fmt) == "sqlite":
+        df = _sql_read("schedule", _season_keys(year, series_id))
     else:
-        raise ValueError("Unsupported format. Use 'csv' or 'parquet'.")
+        if not has_schedule(year=year, series_id=series_id, fmt=fmt):
+            return None
+        try:
+            df = _read_frame(_schedule_cache_path(year, series_id, fmt), _file_format(fmt))
+        except FileNotFoundError:
+            _index().record("-", _file_format(fmt), "schedule", _season_entry_id(year, series_id), ["schedule"])
+            return None
+    if df is not None:
+        _ledger_touch(_schedule_entry(year, series_id))
+    return df
 
 def has_schedule(*, year, series_id, fmt: str | None = None) -> bool:
-    return _schedule_cache_path(year, series_id, fmt).exists()
+    if _format(fmt) == "sqlite":
+        return "schedule" in _sql_tables(_season_keys(year, series_id))
+    return _index().has("schedule", _season_entry_id(year, series_id), _file_format(fmt), "schedule")
 
 def clear_schedule(*, year, series_id, fmt: str | None = None) -> bool:
+    entry = _schedule_entry(year, series_id)
+    if _format(fmt) == "sqlite":
+        _ledger_touch(entry, drop_sql=("schedule",), access=False)
+        return _sql_delete(["schedule"], _season_keys(year, series_id))
     p = _schedule_cache_path(year, series_id, fmt)
     if p.exists():
         p.unlink(missing_ok=True)
+        _index().record("-", _file_format(fmt), "schedule", _season_entry_id(year, series_id), ["schedule"])
+        _ledger_touch(entry, files=_files_bytes(_season_files("schedule", year, series_id)), access=False)
         return True
     return False
 
 def drivers_cache_dir(year) -> Path:
     """
-    <cache_dir>/drivers/<year>
+    <cache_dir>/drivers/<year>, only created once something is written to it
     """
     s = get_settings()
-    d = Path(s.cache_dir) / "drivers" / _seg(year)
-    d.mkdir(parents=True, exist_ok=True)
-    return d
+    return Path(s.cache_dir) / "drivers" / _seg(year)
+
+def _drivers_table(name: str) -> str:
+    return f"drivers_{_sanitize(name)}"
 
 def _drivers_cache_path(year, series_id, name: str, fmt: str | None = None) -> Path:
-    s = get_settings()
-    fmt = (fmt or s.df_format).lower()
-    ext = ".parquet" if fmt == "parquet" else ".csv"
+    ext = _EXTENSIONS.get(_file_format(fmt), ".csv")
     return drivers_cache_dir(year) / f"{_sanitize(str(series_id))}_{_sanitize(name)}{ext}"
 
 def save_drivers_df(df: pd.DataFrame, *, year, series_id, name: str, fmt: str | None = None) -> Path:
     """
-    Save: <cache_dir>/drivers/<year>/<series_id>_<name>.(csv|parquet)
+    Save: <cache_dir>/drivers/<year>/<series_id>_<name>.(csv|parquet) or the drivers_<name> table in sqlite format
     """
     if not isinstance(df, pd.DataFrame):
         raise TypeError(f"save_drivers_df expects a pandas DataFrame; got {type(df).__name__}")
-    s = get_settings()
+    entry = _drivers_entry(year, series_id, name)
+    if _format(fmt) == "sqlite":
+        if not _enabled():
+            return sqlite_path()
+        _ledger_touch(entry, sql=_sql_save({_drivers_table(name): df}, _season_keys(year, series_id)))
+        return sqlite_path()
     path = _drivers_cache_path(year, series_id, name, fmt)
-    if not (s.cache_enabled and s.df_cache_enabled):
+    if not _enabled():
         return path
-    fmt = (fmt or s.df_format).lower()
-    if fmt == "parquet":
-        try:
-            df.to_parquet(path, index=False)
-        except Exception as e:
-            raise RuntimeError("Failed to write parquet. Install 'pyarrow' or set df_format='csv'.") from e
-    elif fmt == "csv":
-        df.to_csv(path, index=False)
-    else:
-        raise ValueError("Unsupported format. Use 'csv' or 'parquet'.")
+    _write_frame(df, path, _file_format(fmt))
+    _index().record("+", _file_format(fmt), "drivers", _season_entry_id(year, series_id), [_sanitize(name)])
+    _ledger_touch(entry, files=_files_bytes(_season_files("drivers", year, series_id, name)))
     return path
 
 def load_drivers_df(*, year, series_id, name: str, fmt: str | None = None) -> pd.DataFrame | None:
     """
     Load: <cache_dir>/drivers/<year>/<series_id>_<name>.(csv|parquet)
     """
-    s = get_settings()
-    if not (s.cache_enabled and s.df_cache_enabled):
+    if not _enabled():
         return None
-    path = _drivers_cache_path(year, series_id, name, fmt)
-    if not path.exists():
-        return None
-    fmt = (fmt or s.df_format).lower()
-    if fmt == "parquet":
-        try:
-            return pd.read_parquet(path)
-        except Exception as e:
-            raise RuntimeError("Failed to read parquet. Install 'pyarrow' or use 'csv'.") from e
-    elif fmt == "csv":
-        return pd.read_csv(path)
+    if _format(fmt) == "sqlite":
+        df = _sql_read(_drivers_table(name), _season_keys(year, series_id))
     else:
-        raise ValueError("Unsupported format. Use 'csv' or 'parquet'.")
+        if not has_drivers_df(year=year, series_id=series_id, name=name, fmt=fmt):
+            return None
+        try:
+            df = _read_frame(_drivers_cache_path(year, series_id, name, fmt), _file_format(fmt))
+        except FileNotFoundError:
+            _index().record("-", _file_format(fmt), "drivers", _season_entry_id(year, series_id), [_sanitize(name)])
+            return None
+    if df is not None:
+        _ledger_touch(_drivers_entry(year, series_id, name))
+    return df
 
 def has_drivers_df(*, year, series_id, name: str, fmt: str | None = None) -> bool:
-    return _drivers_cache_path(year, series_id, name, fmt).exists()
+    if _format(fmt) == "sqlite":
+        return _drivers_table(name) in _sql_tables(_season_keys(year, series_id))
+    return _index().has("drivers", _season_entry_id(year, series_id), _file_format(fmt), _sanitize(name))
 
 def clear_drivers_df(*, year, series_id, name: str, fmt: str | None = None) -> bool:
+    entry = _drivers_entry(year, series_id, name)
+    if _format(fmt) == "sqlite":
+        _ledger_touch(entry, drop_sql=(_drivers_table(name),), access=False)
+        return _sql_delete([_drivers_table(name)], _season_keys(year, series_id))
     p = _drivers_cache_path(year, series_id, name, fmt)
     if p.exists():
         p.unlink(missing_ok=True)
+        _index().record("-", _file_format(fmt), "drivers", _season_entry_id(year, series_id), [_sanitize(name)])
+        _ledger_touch(entry, files=_files_bytes(_season_files("drivers", year, series_id, name)), access=False)
         return True
-    return False
\ No newline at end of file
+    return False
+
+
+def http_cache_dir() -> Path:
+    """
+    <cache_dir>/http
+    """
+    s = get_settings()
+    return Path(s.cache_dir) / "http"
+
+def _http_cache_path(url: str) -> Path:
+    parts = urlsplit(url)
+    segments = [_sanitize(p) for p in parts.path.split("/") if p]
+    if not segments:
+        segments = ["index"]
+    return http_cache_dir().joinpath(_sanitize(parts.netloc), *segments)
+
+def _http_meta_path(path: Path) -> Path:
+    return path.with_name(path.name + ".meta")
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # One temp file per thread, threads writing the same path would otherwise share it
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+def save_http_response(url: str, body: bytes, *, etag: str | None = None, last_modified: str | None = None) -> Path | None:
+    """
+    Save: <cache_dir>/http/<host>/<url path> plus a .meta file with the validators.
+    Nothing is written without a validator since the body could never be revalidated.
+    """
+    s = get_settings()
+    if not (s.cache_enabled and s.http_cache_enabled):
+        return None
+    if not (etag or last_modified):
+        return None
+    path = _http_cache_path(url)
+    _atomic_write(path, body)
+    meta = json.dumps({"url": url, "etag": etag, "last_modified": last_modified}).encode("utf-8")
+    _atomic_write(_http_meta_path(path), meta)
+    _ledger_touch(_http_entry(path), files=len(body) + len(meta))
+    return path
+
+def load_http_response(url: str) -> tuple[bytes, dict] | None:
+    """
+    Load the stored body and validators for url. Returns (body, {"etag", "last_modified"}) or None
+    """
+    s = get_settings()
+    if not (s.cache_enabled and s.http_cache_enabled):
+        return None
+    path = _http_cache_path(url)
+    meta_path = _http_meta_path(path)
+    try:
+        meta = json.loads(meta_path.read_bytes())
+        body = path.read_bytes()
+    except (OSError, ValueError):
+        return None
+    _ledger_touch(_http_entry(path))
+    return body, meta
+
+def clear_http_response(url: str) -> bool:
+    path = _http_cache_path(url)
+    removed = path.exists()
+    path.unlink(missing_ok=True)
+    _http_meta_path(path).unlink(missing_ok=True)
+    _ledger_drop(_http_entry(path))
+    return removed
+
+# Cache manager: a ledger of the size and last access of every cache entry, a race (all its frames and manifest),
+# a schedule, a driver frame or a raw http response, kept in <cache_dir>/ledger.json.
+# Reads and writes update it in memory, it is merged into the file every few seconds, by gc()/stats() and at exit.
+# With Settings.cache_quota_bytes set, every write evicts the least recently used entries until the cache fits.
+# Sizes are file sizes. sqlite frames are counted by the database pages they took when written, and the quota
+# is checked against the real size of the database and its WAL (see _cache_bytes), which are compacted after evicting.
+# Several processes can share a cache dir, their ledgers are merged (latest access wins) and gc() rescans the disk.
+LEDGER_NAME = "ledger.json"
+_LEDGER_FLUSH_SECONDS = 5.0
+
+def _race_entry(year, series_id, race_id) -> str:
+    return f"race/{_seg(year)}/{_seg(series_id)}/{_seg(race_id)}"
+
+def _schedule_entry(year, series_id) -> str:
+    return f"schedule/{_seg(year)}/{_seg(series_id)}"
+
+def _drivers_entry(year, series_id, name: str) -> str:
+    return f"drivers/{_seg(year)}/{_seg(series_id)}/{_sanitize(name)}"
+
+def _http_entry(path: Path) -> str:
+    return "http/" + path.relative_to(http_cache_dir()).as_posix()
+
+def _entry_bytes(entry: dict) -> int:
+    return entry.get("files", 0) + sum(entry.get("sql", {}).values())
+
+def _files_bytes(paths) -> int:
+    total = 0
+    for p in paths:
+        try:
+            total += os.stat(p).st_size
+        except OSError:
+            pass
+    return total
+
+def _dir_bytes(path: Path) -> tuple[int, float]:
+    """ (total size, latest mtime) of the files directly in path """
+    total, mtime = 0, 0.0
+    try:
+        with os.scandir(path) as it:
+            for e in it:
+                if e.is_file():
+                    st = e.stat()
+                    total += st.st_size
+                    mtime = max(mtime, st.st_mtime)
+    except OSError:
+        pass
+    return total, mtime
+
+def _race_dir_bytes(path: Path) -> tuple[int, float]:
+    """ _dir_bytes of a race directory, its raw payloads included """
+    size, mtime = _dir_bytes(path)
+    raw_size, raw_mtime = _dir_bytes(path / RAW_DIR)
+    return size + raw_size, max(mtime, raw_mtime)
+
+def _race_files_bytes(year, series_id, race_id) -> int:
+    return _race_dir_bytes(Path(get_settings().cache_dir) / _seg(year) / _seg(series_id) / _seg(race_id))[0]
+
+def _season_files(kind: str, year, series_id, name: str | None = None) -> list:
+    """ Files of a schedule or driver frame in every file format """
+    base = Path(get_settings().cache_dir) / kind / _seg(year)
+    stem = _sanitize(str(series_id)) if name is None else f"{_sanitize(str(series_id))}_{_sanitize(name)}"
+    return [base / f"{stem}{ext}" for ext in _EXTENSIONS.values()]
+
+def _scan_entries(root: Path) -> dict:
+    """ Entries found on disk: {id: {"files", "sql", "last_access"}} with last_access from the file mtimes """
+    found = {}
+
+    def add(entry_id, size, mtime):
+        entry = found.setdefault(entry_id, {"files": 0, "sql": {}, "last_access": 0.0})
+        entry["files"] += size
+        entry["last_access"] = max(entry["last_access"], mtime)
+
+    def dirs(path):
+        try:
+            return [e for e in os.scandir(path) if e.is_dir()]
+        except OSError:
+            return []
+
+    for year in dirs(root):
+        if year.name.isdigit():
+            for series in dirs(year.path):
+                for race in dirs(series.path):
+                    size, mtime = _race_dir_bytes(Path(race.path))
+                    if size:
+                        add(f"race/{year.name}/{series.name}/{race.name}", size, mtime)
+        elif year.name in ("schedule", "drivers"):
+            for season in dirs(year.path):
+                for e in os.scandir(season.path):
+                    if not e.is_file() or e.name.startswith("."):
+                        continue
+                    stem = e.name.rsplit(".", 1)[0]
+                    if year.name == "drivers":
+                        stem = "/".join(stem.split("_", 1))
+                    st = e.stat()
+                    add(f"{year.name}/{season.name}/{stem}", st.st_size, st.st_mtime)
+    http = root / "http"
+    for dirpath, _, filenames in os.walk(http):
+        for fname in filenames:
+            if fname.startswith("."):
+                continue
+            p = Path(dirpath) / fname
+            body = p.with_name(fname[: -len(".meta")]) if fname.endswith(".meta") else p
+            st = p.stat()
+            add("http/" + body.relative_to(http).as_posix(), st.st_size, st.st_mtime)
+
+    db = root / SQLITE_NAME
+    if db.exists():
+        rows = _sql_connect().execute("SELECT tbl, year, series_id, race_id, rows FROM _frames").fetchall()
+        total_rows = sum(r[4] or 0 for r in rows) or 1
+        db_bytes = _files_bytes([db, db.with_name(db.name + "-wal")])
+        for tbl, year, series_id, race_id, n in rows:
+            if tbl.startswith("race_"):
+                entry_id = f"race/{year}/{series_id}/{race_id}"
+            elif tbl == "schedule":
+                entry_id = f"schedule/{year}/{series_id}"
+            else:
+                entry_id = f"drivers/{year}/{series_id}/{tbl[len('drivers_'):]}"
+            entry = found.setdefault(entry_id, {"files": 0, "sql": {}, "last_access": 0.0})
+            # Share of the database file by rows, only used for frames the ledger has not seen written
+            entry["sql"][tbl] = int(db_bytes * (n or 0) / total_rows)
+    return found
+
+
+class _Ledger:
+    def __init__(self, root: Path):
+        self.root = root
+        self.path = root / LEDGER_NAME
+        self.entries = {}  # id -> {"files", "sql", "last_access", "written"}
+        self._removed = set()
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self._lock = threading.RLock()
+        try:
+            self.entries = json.loads(self.path.read_bytes())["entries"]
+        except (OSError, ValueError, KeyError):
+            # First use on this cache dir (or a broken ledger), start from what is on disk
+            self.entries = _scan_entries(root) if root.exists() else {}
+            self._dirty = bool(self.entries)
+
+    def touch(self, entry_id: str, files: int | None = None, sql: dict | None = None, drop_sql=(),
+              access: bool = True) -> None:
+        """ Record an access and/or new sizes. files replaces the file size, sql updates table sizes """
+        with self._lock:
+            entry = self.entries.get(entry_id)
+            if entry is None:
+                if not access and files is None and not sql:
+                    return
+                entry = self.entries[entry_id] = {"files": 0, "sql": {}, "last_access": 0.0}
+            now = time.time()
+            if access:
+                entry["last_access"] = now
+            if files is not None or sql or drop_sql:
+                entry["written"] = now
+                if files is not None:
+                    entry["files"] = files
+                entry["sql"] = {t: b for t, b in {**entry.get("sql", {}), **(sql or {})}.items() if t not in drop_sql}
+            if not _entry_bytes(entry):
+                self.entries.pop(entry_id)
+                self._removed.add(entry_id)
+            else:
+                self._removed.discard(entry_id)
+            self._dirty = True
+        self.maybe_flush()
+
+    def drop(self, entry_id: str) -> None:
+        with self._lock:
+            self.entries.pop(entry_id, None)
+            self._removed.add(entry_id)
+            self._dirty = True
+
+    def total(self, sql: bool = True) -> int:
+        """ Bytes of every entry, sql=False leaves out the sqlite frames """
+        with self._lock:
+            if sql:
+                return sum(_entry_bytes(e) for e in self.entries.values())
+            return sum(e.get("files", 0) for e in self.entries.values())
+
+    def maybe_flush(self) -> None:
+        if self._dirty and time.monotonic() - self._last_flush > _LEDGER_FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self) -> None:
+        """ Merge with the ledger file (other processes may have written it) and save """
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                disk = json.loads(self.path.read_bytes())["entries"]
+            except (OSError, ValueError, KeyError):
+                disk = {}
+            for entry_id in self._removed:
+                disk.pop(entry_id, None)
+            for entry_id, entry in self.entries.items():
+                theirs = disk.get(entry_id)
+                if theirs is None:
+                    disk[entry_id] = entry
+                    continue
+                newer = entry if entry.get("written", 0) >= theirs.get("written", 0) else theirs
+                disk[entry_id] = {**newer, "last_access": max(entry["last_access"], theirs.get("last_access", 0.0))}
+            self.entries = disk
+            self._removed = set()
+            self._dirty = False
+            self._last_flush = time.monotonic()
+            if self.root.exists():
+                _atomic_write(self.path, json.dumps({"entries": disk}).encode("utf-8"))
+
+    def rescan(self) -> None:
+        """ Sync with the disk: sizes of every entry, entries written without the ledger, entries gone """
+        found = _scan_entries(self.root)
+        with self._lock:
+            for entry_id in set(self.entries) - set(found):
+                self.drop(entry_id)
+            for entry_id, scanned in found.items():
+                entry = self.entries.get(entry_id)
+                if entry is None:
+                    self.entries[entry_id] = scanned
+                    continue
+                entry["files"] = scanned["files"]
+                # Keep the sizes recorded when the sqlite frames were written, estimates for the others
+                known = entry.get("sql", {})
+                entry["sql"] = {t: known.get(t, b) for t, b in scanned["sql"].items()}
+            self._dirty = True
+
+    def lru(self, protect=()) -> list:
+        with self._lock:
+            return sorted((e["last_access"], entry_id, _entry_bytes(e))
+                          for entry_id, e in self.entries.items() if entry_id not in protect)
+
+
+_ledgers = {}
+_ledgers_lock = threading.Lock()
+
+def _ledger() -> _Ledger:
+    root = Path(get_settings().cache_dir)
+    key = (str(root), os.getpid())
+    with _ledgers_lock:
+        ledger = _ledgers.get(key)
+        if ledger is None:
+            ledger = _ledgers[key] = _Ledger(root)
+        return ledger
+
+@atexit.register
+def flush_ledgers() -> None:
+    """ Write the ledger updates of this process (done at exit and every few seconds anyway) """
+    for (_, pid), ledger in list(_ledgers.items()):
+        if pid == os.getpid():
+            try:
+                ledger.flush()
+            except OSError:
+                pass
+
+def _ledger_touch(entry_id: str, **kw) -> None:
+    if not get_settings().cache_enabled:
+        return
+    ledger = _ledger()
+    ledger.touch(entry_id, **kw)
+    if kw.get("files") is not None or kw.get("sql"):
+        _enforce_quota(ledger, protect=(entry_id,))
+
+def _ledger_drop(entry_id: str) -> None:
+    if get_settings().cache_enabled:
+        _ledger().drop(entry_id)
+
+def _evict(entry_id: str) -> None:
+    """ Delete every file and sqlite frame of an entry """
+    kind, *parts = entry_id.split("/")
+    if kind == "race":
+        clear_race(*parts)
+    elif kind in ("schedule", "drivers"):
+        year, series_id = int(parts[0]), int(parts[1])
+        name = parts[2] if kind == "drivers" else None
+        for p in _season_files(kind, year, series_id, name):
+            p.unlink(missing_ok=True)
+        if kind == "schedule":
+            _index().record("-", "*", kind, _season_entry_id(year, series_id), None)
+        else:
+            for fmt in _EXTENSIONS:
+                _index().record("-", fmt, kind, _season_entry_id(year, series_id), [name])
+        table = "schedule" if kind == "schedule" else _drivers_table(name)
+        _sql_delete([table], _season_keys(year, series_id))
+        try:
+            (Path(get_settings().cache_dir) / kind / _seg(year)).rmdir()
+        except OSError:
+            pass
+        _ledger_drop(entry_id)
+    elif kind == "http":
+        path = http_cache_dir().joinpath(*parts)
+        path.unlink(missing_ok=True)
+        _http_meta_path(path).unlink(missing_ok=True)
+        _ledger_drop(entry_id)
+
+def _cache_bytes(ledger: _Ledger) -> int:
+    """ ledger.total() with the sqlite frames counted as the size of the database and its WAL on disk """
+    db = sqlite_path()
+    if not db.exists():
+        return ledger.total()
+    return ledger.total(sql=False) + _files_bytes([db, db.with_name(db.name + "-wal")])
+
+def _enforce_quota(ledger: _Ledger, quota: int | None = None, protect=()) -> list:
+    """
+    Evict least recently used entries until the cache fits in quota. Returns the evicted ids.
+    The sqlite file only shrinks once compacted, which is done before the size is checked again.
+    """
+    quota = get_settings().cache_quota_bytes if quota is None else quota
+    if not quota:
+        return []
+    total = _cache_bytes(ledger)
+    evicted, compact = [], False
+    for _, entry_id, size in ledger.lru(protect):
+        if total <= quota and compact:
+            _sql_compact()
+            compact = False
+            total = _cache_bytes(ledger)
+        if total <= quota:
+            break
+        compact = compact or bool(ledger.entries.get(entry_id, {}).get("sql"))
+        _evict(entry_id)
+        ledger.drop(entry_id)
+        evicted.append(entry_id)
+        total -= size
+    if compact:
+        _sql_compact()
+    return evicted
+
+def gc(quota_bytes: int | None = None) -> dict:
+    """
+    Rescan the cache dir, then evict least recently used entries until it fits in quota_bytes
+    (Settings.cache_quota_bytes when not given, 0 only rescans). The sqlite file is rebuilt when it has
+    free pages (frames evicted or replaced) and its WAL truncated.
+    Returns {"evicted": [entry ids], "freed_bytes", "bytes"} with the sqlite file counted by its size on disk.
+    """
+    ledger = _ledger()
+    ledger.rescan()
+    _index().rebuild()
+    before = _cache_bytes(ledger)
+    evicted = _enforce_quota(ledger, quota_bytes)
+    ledger.flush()
+    if sqlite_path().exists():
+        conn = _sql_connect()
+        # auto_vacuum other than INCREMENTAL (2): a database created before it was set, converted by VACUUM
+        _sql_compact(vacuum=bool(conn.execute("PRAGMA freelist_count").fetchone()[0])
+                     or conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2)
+    after = _cache_bytes(ledger)
+    return {"evicted": evicted, "freed_bytes": before - after, "bytes": after}
+
+def stats() -> dict:
+    """
+    {"cache_dir", "bytes", "quota", "entries", "kinds": {kind: {"entries", "bytes"}}, "oldest_access", "newest_access"}
+    from the ledger (see gc to resync it with the disk). Access times are unix timestamps.
+    "bytes" counts the sqlite file by its size on disk, the kinds by the pages their frames took when written.
+    """
+    ledger = _ledger()
+    ledger.flush()
+    kinds = {}
+    with ledger._lock:
+        entries = list(ledger.entries.items())
+    for entry_id, entry in entries:
+        kind = kinds.setdefault(entry_id.split("/", 1)[0], {"entries": 0, "bytes": 0})
+        kind["entries"] += 1
+        kind["bytes"] += _entry_bytes(entry)
+    access = [e["last_access"] for _, e in entries]
+    return {
+        "cache_dir": str(ledger.root),
+        "bytes": _cache_bytes(ledger),
+        "quota": get_settings().cache_quota_bytes,
+        "entries": len(entries),
+        "kinds": kinds,
+        "oldest_access": min(access, default=None),
+        "newest_access": max(access, default=None),
+    }
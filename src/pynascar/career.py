@@ -0,0 +1,108 @@
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Tuple
+import pandas as pd
+
+from .core.base_api import NascarAPI
+from .core.metrics import aggregate_season_stats
+from .driver import DriversData
+
+CAREER_KEYS = ['year', 'series_id', 'race_id', 'driver_id']
+
+
+def _season_tables(year: int, series_id: int, use_cache_only: bool, sleep_seconds: int, reload_cache: bool,
+                   incremental: bool, api: NascarAPI, workers: Optional[int]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """(per race table, pit stops) of one season, both with year and series_id columns"""
+    dd = None
+    if incremental and not reload_cache:
+        dd = DriversData.load(year, series_id)
+        if dd is not None:
+            dd.update(use_cache_only=use_cache_only, sleep_seconds=sleep_seconds, api_client=api, workers=workers)
+    if dd is None:
+        dd = DriversData.build(year, series_id, use_cache_only=use_cache_only, sleep_seconds=sleep_seconds,
+                               reload_cache=reload_cache, api_client=api, workers=workers)
+    table = DriversData.concat_tables([dd])
+    pit_stops = dd.pit_stops.reset_index(drop=True)
+    if not pit_stops.empty:
+        pit_stops = pit_stops.assign(year=year, series_id=series_id)
+    return table, pit_stops
+
+
+@dataclass
+class CareerData:
+    """
+    Driver data across several years and series in one table keyed by
+    (year, series_id, race_id, driver_id). Only the combined tables are kept, not one
+    DriversData per season.
+    """
+    years: List[int]
+    series_ids: List[int]
+    table: pd.DataFrame = field(default_factory=pd.DataFrame, repr=False)
+    pit_stops: pd.DataFrame = field(default_factory=pd.DataFrame, repr=False)
+
+    @classmethod
+    def build(
+        cls,
+        years: Iterable[int],
+        series_ids: Iterable[int] = (1, 2, 3),
+        use_cache_only: bool = True,
+        sleep_seconds: int = 0,
+        reload_cache: bool = False,
+        incremental: bool = True,
+        api_client: Optional[NascarAPI] = None,
+        max_workers: int = 4,
+        workers: Optional[int] = None
+    ) -> 'CareerData':
+        """
+        Build every (year, series_id) season, max_workers seasons at a time on threads sharing
+        one API client (and so one connection pool and rate limiter) and the cache.
+        incremental reuses the saved season state of DriversData and only adds new races.
+        workers is passed to DriversData.build to process the races of a season in processes. Seasons are
+        then built one at a time: the processes already use the CPUs, which threads would only contend for.
+        """
+        years, series_ids = list(years), list(series_ids)
+        api = api_client or NascarAPI()
+        seasons = [(year, series_id) for year in years for series_id in series_ids]
+
+        def season(key):
+            try:
+                return _season_tables(*key, use_cache_only, sleep_seconds, reload_cache, incremental, api, workers)
+            except Exception as e:
+                print(f"Error processing season {key[0]}-{key[1]}: {e}")
+                return pd.DataFrame(), pd.DataFrame()
+
+        threads = 1 if workers and workers > 1 else max(1, max_workers)
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            # map keeps the (year, series_id) order
+            results = list(pool.map(season, seasons))
+
+        tables = [t for t, _ in results if not t.empty]
+        pits = [p for _, p in results if not p.empty]
+        instance = cls(years=years, series_ids=series_ids)
+        if tables:
+            table = pd.concat(tables, ignore_index=True)
+            table.index = pd.MultiIndex.from_frame(table[CAREER_KEYS])
+            # Sorted keys so season/race lookups are index slices
+            instance.table = table.sort_index(kind='stable')
+        if pits:
+            instance.pit_stops = pd.concat(pits, ignore_index=True)
+        return instance
+
+    def season(self, year: int, series_id: int) -> pd.DataFrame:
+        """Per race rows of one season."""
+        try:
+            return self.table.loc[(year, series_id)].reset_index(drop=True)
+        except KeyError:
+            return pd.DataFrame()
+
+    def driver_history(self, driver_id: int) -> pd.DataFrame:
+        """Every race of a driver across the years and series."""
+        if self.table.empty:
+            return pd.DataFrame()
+        rows = self.table[self.table['driver_id'] == driver_id]
+        return rows.reset_index(drop=True)
+
+    def summary(self, by=('year', 'series_id', 'driver_id')) -> pd.DataFrame:
+        """Season stats, by default per driver and season. by=('series_id', 'driver_id') for career totals."""
+        return aggregate_season_stats(self.table, by=by)
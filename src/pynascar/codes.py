@@ -11,11 +11,11 @@ FLAG_CODE = {
 }
 
 
+# Cleaned name (see utils.normalize_name) -> canonical name. Names missing here are used as is
 NAME_MAPPINGS = {
-    "Daniel Suarez": "Daniel Suarez",
     "Daniel Suárez": "Daniel Suarez",
-    "John Hunter Nemechek": "John Hunter Nemechek",
     "John H. Nemechek": "John Hunter Nemechek",
     "Ricky Stenhouse Jr": "Ricky Stenhouse Jr.",
-    "Ricky Stenhouse Jr.": "Ricky Stenhouse Jr.",
+    "Martin Truex Jr": "Martin Truex Jr.",
+    "Dale Earnhardt Jr": "Dale Earnhardt Jr.",
 }
\ No newline at end of file
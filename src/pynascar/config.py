@@ -9,7 +9,17 @@ class Settings:
     cache_enabled: bool = bool(os.getenv("PYNASCAR_CACHE_ENABLED", "1") not in ("0", "false", "False"))
     df_cache_enabled: bool = bool(os.getenv("PYNASCAR_DF_CACHE", "1") not in ("0", "false", "False"))
     cache_dir: Path = Path(os.getenv("PYNASCAR_CACHE_DIR", Path.home() / ".cache" / "pynascar")).expanduser()
-    df_format: str = os.getenv("PYNASCAR_DF_FORMAT", "parquet")  # parquet|csv
+    df_format: str = os.getenv("PYNASCAR_DF_FORMAT", "parquet")  # parquet|csv|bundle|sqlite|arrow
+    # Compression of the arrow format: uncompressed (memory mapped without decoding) or lz4 (smaller files)
+    arrow_compression: str = os.getenv("PYNASCAR_ARROW_COMPRESSION", "uncompressed")
+    # Raw endpoint bodies + ETag/Last-Modified, used for conditional GETs in NascarAPI
+    http_cache_enabled: bool = bool(os.getenv("PYNASCAR_HTTP_CACHE", "1") not in ("0", "false", "False"))
+    # Byte budget of the in memory tier over load_df (0 turns it off)
+    memory_cache_bytes: int = int(os.getenv("PYNASCAR_MEMORY_CACHE_BYTES", 256 * 1024 * 1024))
+    # Size cap of cache_dir, least recently used races/schedules/driver frames/responses are evicted (0 is no cap)
+    cache_quota_bytes: int = int(os.getenv("PYNASCAR_CACHE_QUOTA_BYTES", 0))
+    # Keep the raw endpoint payloads of every race (gzip JSON) so frames can be reprocessed offline
+    raw_cache_enabled: bool = bool(os.getenv("PYNASCAR_RAW_CACHE", "0") not in ("0", "false", "False"))
 
 _settings = Settings()
 
@@ -21,9 +31,20 @@ def set_options(
         df_cache_enabled: bool | None = None,
         cache_dir: Path | str | None = None,
         df_format: str | None = None,
+        http_cache_enabled: bool | None = None,
+        memory_cache_bytes: int | None = None,
+        arrow_compression: str | None = None,
+        cache_quota_bytes: int | None = None,
+        raw_cache_enabled: bool | None = None,
     ) -> Settings:
     """
-    Configure DataFrame caching only. Supported formats: csv, parquet. No HTTP or SQL rn 
+    Configure caching. Supported DataFrame formats: csv, parquet, bundle (one file per race),
+    sqlite (every frame in <cache_dir>/pynascar.sqlite, see caching.sql_query), arrow (or feather, Arrow IPC
+    files memory mapped on read). arrow_compression is 'uncompressed' or 'lz4'.
+    cache_quota_bytes caps the size of cache_dir, see caching.gc()/caching.stats().
+    http_cache_enabled keeps raw API responses under <cache_dir>/http for conditional GETs.
+    memory_cache_bytes caps the frames kept in memory after a cache read, 0 turns that off.
+    raw_cache_enabled keeps the raw payloads of every race under <race dir>/raw, see pynascar.reprocess.
     """
     global _settings
     s = _settings
@@ -32,14 +53,25 @@ def set_options(
         cache_dir = Path(cache_dir)
 
     fmt = s.df_format if df_format is None else str(df_format).lower()
-    if fmt not in ("csv", "parquet"):
+    if fmt == "feather":
+        fmt = "arrow"
+    if fmt not in ("csv", "parquet", "bundle", "sqlite", "arrow"):
         fmt = "parquet"
-        raise UserWarning("Format must be csv or parquet. This will default to 'parquet'.")
+        raise UserWarning("Format must be csv, parquet, bundle, sqlite or arrow. This will default to 'parquet'.")
+
+    compression = s.arrow_compression if arrow_compression is None else str(arrow_compression).lower()
+    if compression not in ("uncompressed", "lz4"):
+        raise UserWarning("arrow_compression must be 'uncompressed' or 'lz4'.")
 
     _settings = Settings(
         cache_enabled = s.cache_enabled if cache_enabled is None else cache_enabled,
         df_cache_enabled = s.df_cache_enabled if df_cache_enabled is None else df_cache_enabled,
         cache_dir = s.cache_dir if cache_dir is None else Path(cache_dir).expanduser(),
         df_format = fmt,
+        arrow_compression = compression,
+        cache_quota_bytes = s.cache_quota_bytes if cache_quota_bytes is None else max(0, int(cache_quota_bytes)),
+        http_cache_enabled = s.http_cache_enabled if http_cache_enabled is None else http_cache_enabled,
+        memory_cache_bytes = s.memory_cache_bytes if memory_cache_bytes is None else max(0, int(memory_cache_bytes)),
+        raw_cache_enabled = s.raw_cache_enabled if raw_cache_enabled is None else raw_cache_enabled,
     )
     return _settings
\ No newline at end of file
@@ -0,0 +1,67 @@
+import asyncio
+from typing import Dict, Optional, Any
+
+from .base_api import NascarAPI, NASCARConfig
+
+class AsyncNascarAPI:
+    """
+    asyncio counterpart to NascarAPI.
+    Requests go through the pooled session of a regular NascarAPI on worker threads, so retries,
+    timeouts and connection reuse behave the same as the sync client. Concurrency is capped at the
+    session pool size so requests never wait on a free connection.
+    """
+    def __init__(self, config: NASCARConfig = NASCARConfig(), client: Optional[NascarAPI] = None,
+                 max_concurrency: Optional[int] = None):
+        self.client = client or NascarAPI(config)
+        self.config = self.client.config
+        self.max_concurrency = max_concurrency or self.config.pool_maxsize
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop = None
+
+    def _limit(self) -> asyncio.Semaphore:
+        # Semaphores are bound to the loop they are first used on, recreate per loop
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    async def _call(self, func, *args) -> Optional[Dict[Any, Any]]:
+        async with self._limit():
+            return await asyncio.to_thread(func, *args)
+
+    async def get_race_endpoint(self, endpoint:str, year:int, series_id:int, race_id:int, live:bool = False) -> Optional[Dict]:
+        return await self._call(self.client.get_race_endpoint, endpoint, year, series_id, race_id, live)
+
+    async def get_race_data(self, year:int, series_id:int, race_id:int, live:bool = False) -> Optional[Dict]:
+        return await self.get_race_endpoint("weekend-feed", year, series_id, race_id, live)
+
+    async def get_lap_time_data(self, year:int, series_id:int, race_id:int, live:bool = False) -> Optional[Dict]:
+        return await self.get_race_endpoint("lap-times", year, series_id, race_id, live)
+
+    async def get_pit_stop_data(self, year:int, series_id:int, race_id:int, live:bool = False) -> Optional[Dict]:
+        return await self.get_race_endpoint("live-pit-data", year, series_id, race_id, live)
+
+    async def get_event_notes_data(self, year:int, series_id:int, race_id:int, live:bool = False) -> Optional[Dict]:
+        return await self.get_race_endpoint("lap-notes", year, series_id, race_id, live)
+
+    async def get_driver_stat_data(self, year:int, series_id:int, race_id:int) -> Optional[Dict]:
+        return await self.get_race_endpoint("loopstats", year, series_id, race_id)
+
+    async def get_advanced_driver_stat_data(self, year:int, series_id:int, race_id:int) -> Optional[Dict]:
+        return await self.get_race_endpoint("live-feed", year, series_id, race_id)
+
+    async def get_schedule(self, year:int):
+        return await self._call(self.client.get_schedule, year)
+
+    async def gather_race_endpoints(self, endpoints, year:int, series_id:int, race_id:int,
+                                    live:bool = False) -> Dict[str, Optional[Dict]]:
+        """ Fetch several race endpoints at once. Returns {endpoint: payload or None} """
+        endpoints = list(endpoints)
+        payloads = await asyncio.gather(
+            *(self.get_race_endpoint(e, year, series_id, race_id, live) for e in endpoints)
+        )
+        return dict(zip(endpoints, payloads))
+
+    def close(self) -> None:
+        self.client.close()
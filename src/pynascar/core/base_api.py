@@ -1,7 +1,17 @@
+import json
 import pandas as pd
 import requests
-from dataclasses import dataclass 
+from requests.adapters import HTTPAdapter
+from dataclasses import dataclass
 from typing import Dict, List, Optional, Union,Any
+from ..caching import load_http_response, save_http_response
+from .rate_limit import AdaptiveRateLimiter, get_shared_rate_limiter
+
+# Responses worth another attempt. Anything else (404 etc) is returned as a failure right away
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Everything a single race pulls. live-feed and loopstats are not year scoped
+RACE_ENDPOINTS = ("weekend-feed", "lap-times", "live-pit-data", "lap-notes", "loopstats", "live-feed")
 
 @dataclass
 class NASCARConfig:
@@ -11,67 +21,164 @@ class NASCARConfig:
     loop_stats_url: str = "https://cf.nascar.com/loopstats/prod"
     default_timeout:int = 60
     retry_attempts:int = 2
+    connect_timeout:float = 5.0
+    read_timeout:Optional[float] = None  # falls back to default_timeout
+    backoff_factor:float = 0.5
+    max_backoff:float = 30.0
+    pool_connections:int = 4
+    pool_maxsize:int = 16
+    # Adaptive limiter (requests per second). Starts at requests_per_second and moves between the bounds
+    requests_per_second:float = 5.0
+    min_requests_per_second:float = 0.2
+    max_requests_per_second:float = 20.0
+    burst:int = 5
 
 class NascarAPI:
-    """ 
+    """
     Client for NASCAR API data
-    If new endpoints are discovered, they should be added here. 
+    If new endpoints are discovered, they should be added here.
+
+    A single keep-alive session is shared by every request made through this client, so
+    reuse one instance (e.g. pass api_client to Race) instead of creating one per race.
+    Requests are paced by an AdaptiveRateLimiter shared by all clients with the same limiter settings.
     """
-    def __init__(self, config: NASCARConfig = NASCARConfig()):
+    def __init__(self, config: NASCARConfig = NASCARConfig(), session: Optional[requests.Session] = None,
+                 rate_limiter: Optional[AdaptiveRateLimiter] = None):
         self.config = config
+        self.session = session or self._build_session()
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter(
+            config.requests_per_second, config.burst,
+            config.min_requests_per_second, config.max_requests_per_second,
+        )
+
+    def _build_session(self) -> requests.Session:
+        session = requests.Session()
+        # Retries are handled in _make_request so the backoff is driven by config.retry_attempts
+        adapter = HTTPAdapter(pool_connections=self.config.pool_connections,
+                              pool_maxsize=self.config.pool_maxsize,
+                              max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Accept": "application/json", "Accept-Encoding": "gzip, deflate"})
+        return session
+
+    @property
+    def timeout(self) -> tuple:
+        """ (connect, read) timeout passed to requests """
+        read = self.config.read_timeout if self.config.read_timeout is not None else self.config.default_timeout
+        return (self.config.connect_timeout, read)
+
+    def _backoff(self, attempt:int, response: Optional[requests.Response] = None) -> float:
+        """ Seconds to wait before retry number `attempt` (0 based). Honors Retry-After when given """
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.strip().isdigit():
+                return min(float(retry_after), self.config.max_backoff)
+        return min(self.config.backoff_factor * (2 ** attempt), self.config.max_backoff)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
     def _make_request(self,url:str) -> Optional[Dict[Any,Any]]:
-        try:
-            response = requests.get(url,timeout=self.config.default_timeout)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print(f"Failed to fetch data for {url}. Error: {e}")
-            return None
-    
+        # Conditional GET against the raw response cache. A 304 is answered from disk
+        cached = load_http_response(url)
+        headers = {}
+        if cached is not None:
+            validators = cached[1]
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+        attempts = max(0, int(self.config.retry_attempts)) + 1
+        for attempt in range(attempts):
+            response = None
+            try:
+                self.rate_limiter.acquire()
+                response = self.session.get(url,timeout=self.timeout,headers=headers)
+                if response.status_code in RETRY_STATUSES:
+                    # The limiter holds every caller for the backoff, not just this request
+                    self.rate_limiter.record_throttle(self._backoff(attempt, response))
+                    if attempt < attempts - 1:
+                        continue
+                else:
+                    self.rate_limiter.record_success()
+                if response.status_code == 304 and cached is not None:
+                    return json.loads(cached[0])
+                response.raise_for_status()
+                data = json.loads(response.content)
+                try:
+                    save_http_response(url, response.content,
+                                       etag=response.headers.get("ETag"),
+                                       last_modified=response.headers.get("Last-Modified"))
+                except OSError as e:
+                    # The response is good, only the cache copy is lost
+                    print(f"Failed to cache response for {url}. Error: {e}")
+                return data
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self.rate_limiter.record_throttle(self._backoff(attempt))
+                if attempt < attempts - 1:
+                    continue
+                print(f"Failed to fetch data for {url}. Error: {e}")
+                return None
+            except (requests.RequestException, ValueError) as e:
+                print(f"Failed to fetch data for {url}. Error: {e}")
+                return None
+        return None
+
+    def race_endpoint_url(self, endpoint:str, year:int, series_id:int, race_id:int, live:bool = False) -> str:
+        """
+        Build the url for one of the per race endpoints
+        weekend-feed, lap-times, live-pit-data, lap-notes use the cacher (or live) feed,
+        loopstats and live-feed have their own locations.
+        """
+        if endpoint == "loopstats":
+            return f"{self.config.loop_stats_url}/{year}/{series_id}/{race_id}.json"
+        if endpoint == "live-feed":
+            return f"{self.config.live_url}/series_{series_id}/{race_id}/live-feed.json"
+        if endpoint not in RACE_ENDPOINTS:
+            raise ValueError(f"Unknown race endpoint: {endpoint}")
+        if live:
+            return f"{self.config.live_url}/series_{series_id}/{race_id}/{endpoint}.json"
+        return f"{self.config.base_url}/{year}/{series_id}/{race_id}/{endpoint}.json"
+
+    def schedule_url(self, year:int) -> str:
+        return f"{self.config.base_url}/{year}/race_list_basic.json"
+
+    def get_race_endpoint(self, endpoint:str, year:int, series_id:int, race_id:int, live:bool = False) -> Optional[Dict]:
+        """ Make Request for any of RACE_ENDPOINTS"""
+        return self._make_request(self.race_endpoint_url(endpoint, year, series_id, race_id, live))
+
     def get_race_data(self,year:int,series_id:int,race_id:int, live:bool = False) -> Optional[Dict]:
         """ Make Request for Race weekend data"""
-        if live:
-            url = f"{self.config.live_url}/series_{series_id}/{race_id}/weekend-feed.json"
-        else:
-            url = f"{self.config.base_url}/{year}/{series_id}/{race_id}/weekend-feed.json"
-        return self._make_request(url)
+        return self._make_request(self.race_endpoint_url("weekend-feed", year, series_id, race_id, live))
 
     def get_lap_time_data(self,year:int,series_id:int,race_id:int, live:bool = False) -> Optional[Dict]:
         """ Make Request for Lap time data"""
-        if live:
-            url = f"{self.config.live_url}/series_{series_id}/{race_id}/lap-times.json"
-        else:
-            url = f"{self.config.base_url}/{year}/{series_id}/{race_id}/lap-times.json"
-        return self._make_request(url)
+        return self._make_request(self.race_endpoint_url("lap-times", year, series_id, race_id, live))
 
     def get_pit_stop_data(self,year:int,series_id:int,race_id:int, live:bool = False) -> Optional[Dict]:
         """ Make Request for Pit stop data"""
-        if live:
-            url = f"{self.config.live_url}/series_{series_id}/{race_id}/live-pit-data.json"
-        else:
-            url = f"{self.config.base_url}/{year}/{series_id}/{race_id}/live-pit-data.json"
-        return self._make_request(url)
-    
+        return self._make_request(self.race_endpoint_url("live-pit-data", year, series_id, race_id, live))
+
     def get_event_notes_data(self,year:int,series_id:int,race_id:int, live:bool = False) -> Optional[Dict]:
         """ Make Request for Event notes data"""
-        if live:
-            url = f"{self.config.live_url}/series_{series_id}/{race_id}/lap-notes.json"
-        else:
-            url = f"{self.config.base_url}/{year}/{series_id}/{race_id}/lap-notes.json"
-        return self._make_request(url)
+        return self._make_request(self.race_endpoint_url("lap-notes", year, series_id, race_id, live))
 
     def get_driver_stat_data(self,year:int,series_id:int,race_id:int) -> Optional[Dict]:
         """ Make Request for Driver statistics data"""
-        url = f"{self.config.loop_stats_url}/{year}/{series_id}/{race_id}.json"
-        return self._make_request(url)
+        return self._make_request(self.race_endpoint_url("loopstats", year, series_id, race_id))
 
     def get_advanced_driver_stat_data(self,year:int,series_id:int,race_id:int) -> Optional[Dict]:
         """ Make Request for Driver statistics data"""
-        url = f"{self.config.live_url}/series_{series_id}/{race_id}/live-feed.json"
-        return self._make_request(url)
-    
+        return self._make_request(self.race_endpoint_url("live-feed", year, series_id, race_id))
+
     def get_schedule(self,year:int):
         """Make requests for race schedule data"""
-        url = f"{self.config.base_url}/{year}/race_list_basic.json"
-        return self._make_request(url)
\ No newline at end of file
+        return self._make_request(self.schedule_url(year))
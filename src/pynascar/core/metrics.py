@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+from typing import Dict
+
+# Per race driver metrics for the whole field at once. Every table of the race is grouped
+# by driver_id a single time instead of being filtered once per driver.
+
+RESULT_COLUMNS = ['finishing_position', 'starting_position', 'laps_completed',
+                  'points', 'playoff_points', 'qualifying_position', 'qualifying_speed']
+DRIVER_INFO_COLUMNS = ['driver_name', 'team', 'car_number', 'manufacturer']
+_NOT_STATS = ['driver_id', 'race_id', 'driver_name']
+_PIT_TIME_COLUMNS = ["pit_time", "Pit Time", "total_duration"]
+
+
+def _float64(s: pd.Series) -> pd.Series:
+    """ float32 columns (see core.schemas) widened by their decimal value, 29.9 rather than 29.899999618530273 """
+    return s.astype(str).astype('float64') if s.dtype == 'float32' else s
+
+
+def _by_driver(df: pd.DataFrame) -> pd.DataFrame:
+    """ First row of every driver, indexed by (int) driver_id """
+    if df is None or df.empty or 'driver_id' not in df.columns:
+        return pd.DataFrame()
+    ids = pd.to_numeric(df['driver_id'], errors='coerce')
+    df = df[ids.notna()].drop_duplicates('driver_id')
+    df.index = pd.Index(ids[df.index].astype(int), name='driver_id')
+    return df
+
+
+def _stage_metrics(stage_df: pd.DataFrame, stage_num: int) -> pd.DataFrame:
+    stage = _by_driver(stage_df)
+    if stage.empty:
+        return stage
+    position = 'finishing_position' if 'finishing_position' in stage.columns else 'position'
+    points = 'stage_points' if 'stage_points' in stage.columns else 'points'
+    return pd.DataFrame({
+        f'stage{stage_num}_position': stage.get(position),
+        f'stage{stage_num}_points': stage.get(points),
+    }, index=stage.index)
+
+
+def _stat_metrics(stats_df: pd.DataFrame, adv_df: pd.DataFrame) -> pd.DataFrame:
+    """ Loop stats with the advanced stats on top. Advanced values win unless missing """
+    stats = _by_driver(stats_df).drop(columns=_NOT_STATS, errors='ignore')
+    adv = _by_driver(adv_df).drop(columns=_NOT_STATS, errors='ignore')
+    if stats.empty:
+        return adv
+    if adv.empty:
+        return stats
+    stats = stats.reindex(stats.index.union(adv.index))
+    for col in adv.columns:
+        stats[col] = adv[col].combine_first(stats[col]) if col in stats.columns else adv[col]
+    return stats
+
+
+def _lap_metrics(laps: pd.DataFrame) -> pd.DataFrame:
+    """ Speed metrics of every driver. Per lap max and rank are computed once for the field """
+    if laps.empty or 'driver_id' not in laps.columns:
+        return pd.DataFrame()
+    speed = laps['lap_speed']
+    by_lap = speed.groupby(laps['Lap'])
+    lap_metrics = pd.DataFrame({
+        'avg_lap_speed': speed,
+        'fastest_lap': speed,
+        'total_laps': laps['Lap'],
+        'leader_laps': speed.eq(by_lap.transform('max')),
+        'avg_speed_rank': by_lap.rank(ascending=False, method='min'),
+    }).groupby(laps['driver_id']).agg({
+        'avg_lap_speed': 'mean',
+        'fastest_lap': 'max',
+        'total_laps': 'max',
+        'leader_laps': 'sum',
+        'avg_speed_rank': 'mean',
+    })
+    lap_metrics.index = pd.Index(lap_metrics.index.astype(int), name='driver_id')
+    return lap_metrics
+
+
+def _pit_metrics(pits: pd.DataFrame) -> pd.DataFrame:
+    if pits.empty or 'driver_id' not in pits.columns:
+        return pd.DataFrame()
+    ids = pits['driver_id']
+    pit_metrics = pd.DataFrame({'total_pit_stops': ids.groupby(ids).size()})
+    pit_time_col = next((c for c in _PIT_TIME_COLUMNS if c in pits.columns), None)
+    if pit_time_col:
+        pit_metrics['avg_pit_time'] = _float64(pd.to_numeric(pits[pit_time_col], errors='coerce')).groupby(ids).mean()
+    pit_metrics.index = pd.Index(pit_metrics.index.astype(int), name='driver_id')
+    return pit_metrics
+
+
+def compute_race_metrics(race) -> pd.DataFrame:
+    """
+    Metrics of every driver in the race results, one row per driver indexed by driver_id.
+    Columns follow Driver.add_race_data: results, stage positions/points, loop and advanced
+    stats, lap analysis (avg/fastest speed, leader laps, avg speed rank) and pit stops.
+    Missing values are NaN.
+    """
+    results = _by_driver(race.results.results)
+    if results.empty:
+        return pd.DataFrame()
+
+    parts = [results.reindex(columns=RESULT_COLUMNS)]
+    for stage_num in [1, 2, 3]:
+        parts.append(_stage_metrics(getattr(race.results, f'stage_{stage_num}'), stage_num))
+    parts.append(_stat_metrics(race.driver_data.drivers, race.driver_data.driver_stats_advanced))
+    parts.append(_lap_metrics(race.telemetry.lap_times))
+    parts.append(_pit_metrics(race.telemetry.pit_stops))
+
+    parts = [p.reindex(results.index) for p in parts if not p.empty]
+    return pd.concat(parts, axis=1)
+
+
+def metrics_records(metrics: pd.DataFrame) -> Dict[int, Dict]:
+    """ {driver_id: {metric: value}}. Nullable ints come out as NaN so the columns stay numeric """
+    metrics = metrics.apply(_float64)
+    values = metrics.astype(object)
+    return values.where(metrics.notna(), np.nan).to_dict('index')
+
+
+def driver_info(results: pd.DataFrame) -> Dict[int, Dict]:
+    """ {driver_id: {driver_name, team, car_number, manufacturer}} from the race results """
+    results = _by_driver(results)
+    if results.empty:
+        return {}
+    return results.reindex(columns=DRIVER_INFO_COLUMNS).to_dict('index')
+
+
+
+# Key columns of the per race tables, never averaged
+SEASON_KEYS = ['year', 'series_id', 'race_id', 'driver_id']
+_TOTALS = [('points', 'total_points'), ('playoff_points', 'total_playoff_points')]
+_LAP_TOTALS = [('leader_laps', 'total_leader_laps'), ('passes_green_flag', 'total_passes_green_flag'),
+               ('passed_green_flag', 'total_passed_green_flag')]
+
+
+def aggregate_season_stats(table: pd.DataFrame, by=('driver_id',)) -> pd.DataFrame:
+    """
+    Season summary of a per race table (DriversData.table, or several seasons concatenated
+    with year/series_id columns) in one grouped pass. One row per `by` group with the
+    driver info of its last row, the mean of every numeric metric, total_races, the point
+    and pass totals and wins/top5s/top10s.
+    by=('year', 'driver_id') gives a row per driver and season.
+    """
+    by = list(by)
+    if table is None or table.empty:
+        return pd.DataFrame()
+    df = table.reset_index(drop=True)
+    groups = df.groupby(by, sort=False)
+
+    info = groups[[c for c in DRIVER_INFO_COLUMNS if c in df.columns]].last()
+    metric_cols = [c for c in df.select_dtypes(include=['number']).columns
+                   if c not in SEASON_KEYS and c not in by and c != 'norm_speed']
+    stats = groups[metric_cols].mean()
+    stats['total_races'] = groups.size()
+
+    def total(col):
+        return pd.to_numeric(df[col], errors='coerce').groupby([df[k] for k in by], sort=False).sum()
+
+    for col, name in _TOTALS:
+        if col in df.columns:
+            stats[name] = total(col)
+    if 'finishing_position' in df.columns:
+        finish = pd.to_numeric(df['finishing_position'], errors='coerce')
+        keys = [df[k] for k in by]
+        stats['wins'] = finish.eq(1).groupby(keys, sort=False).sum()
+        stats['top5s'] = finish.le(5).groupby(keys, sort=False).sum()
+        stats['top10s'] = finish.le(10).groupby(keys, sort=False).sum()
+    for col, name in _LAP_TOTALS:
+        if col in df.columns:
+            stats[name] = total(col)
+
+    return pd.concat([info, stats], axis=1).reset_index()
@@ -1,7 +1,13 @@
 from typing import List, Dict, Any, Optional,Tuple
+import numpy as np
 import pandas as pd
 import re 
 from ..codes import FLAG_CODE
+from .schemas import apply_schema
+
+# Version of the processing below and of the name/id mapping Race does on top of it. Bump it whenever
+# the output of a process_* method changes, cached frames stamped with another version are re-derived.
+PROCESSOR_VERSION = 1
 
 class NASCARDataProcessor:
     """ 
@@ -39,7 +45,7 @@ class NASCARDataProcessor:
                 'playoff_points': i.get('playoff_points_earned'),
                 })
 
-        return pd.DataFrame(driver_results)
+        return apply_schema(pd.DataFrame(driver_results), 'results')
     
     @staticmethod
     def process_caution_data(data: Dict[str, Any]) -> pd.DataFrame:
@@ -57,7 +63,7 @@ class NASCARDataProcessor:
                     'comment': i.get('comment'),
                     'flag_state': i.get('flag_state'),
                 })
-        return pd.DataFrame(caution_rows)
+        return apply_schema(pd.DataFrame(caution_rows), 'cautions')
     
     @staticmethod
     def process_leader_data(data:Dict[str, Any]) -> pd.DataFrame:
@@ -74,7 +80,7 @@ class NASCARDataProcessor:
                     'driver_name': None,
                     'car_number': i.get('car_number')
                 })
-        return pd.DataFrame(leader_list)
+        return apply_schema(pd.DataFrame(leader_list), 'lead_changes')
 
     @staticmethod
     def process_stage_data(data:Dict[str, Any],stage_number:int) -> pd.DataFrame:
@@ -94,7 +100,7 @@ class NASCARDataProcessor:
                 'stage_points': result.get('stage_points'),
             })
         
-        return pd.DataFrame(stage_results)
+        return apply_schema(pd.DataFrame(stage_results), f'stage_{stage_number}_results')
     
     # weekend_runs = data.get('weekend_runs', [])
     @staticmethod
@@ -141,34 +147,42 @@ class NASCARDataProcessor:
         qualifying_data = pd.DataFrame(quali_res) if quali_res else pd.DataFrame()
         qualifying_data['qualifying_number'] = qualifying_data['qualifying_name'].apply(lambda x: _parse_practice_quali_number(x, practice=False)) if not qualifying_data.empty else None
         qualifying_data = qualifying_data.sort_values(by='position') if not qualifying_data.empty else pd.DataFrame()
-        return practice_data, qualifying_data
+        return apply_schema(practice_data, 'practice'), apply_schema(qualifying_data, 'qualifying')
 
     @staticmethod
     def process_laps_data(data: Dict[str, Any]) -> pd.DataFrame:
+        """
+        One row per car per lap. Built column by column: the per car fields are stored once as
+        categoricals and repeated through their codes, lap fields are collected into flat lists.
+        lap_time is a timedelta (the feed gives seconds), lap_speed a float.
+        """
         if not data:
             return pd.DataFrame()
-        
-        lap_times = []
-        for i in data['laps']:
-                driver = i.get('FullName')
-                number = i.get('Number')
-                manufacturer = i.get('Manufacturer')
-                for j in i.get('Laps', []):
-                    lap_times.append({
-                        'driver_name': driver,
-                        'car_number': number,
-                        'manufacturer': manufacturer,
-                        'Lap': j.get('Lap'),
-                        'lap_time': j.get('LapTime'),
-                        'lap_speed': j.get('LapSpeed'),
-                        'position': j.get('RunningPos'),
-                    })
-        laps = pd.DataFrame(lap_times)
-        laps['Lap'] = pd.to_numeric(laps['Lap'], errors='coerce').astype('Int64')
-        laps['lap_time'] = pd.to_timedelta(laps['lap_time'], errors='coerce')
-        laps['lap_speed'] = pd.to_numeric(laps['lap_speed'], errors='coerce')
 
-        return laps
+        cars = data.get('laps') or []
+        counts, drivers, numbers, manufacturers = [], [], [], []
+        lap, lap_time, lap_speed, position = [], [], [], []
+        for car in cars:
+            car_laps = car.get('Laps') or []
+            counts.append(len(car_laps))
+            drivers.append(car.get('FullName'))
+            numbers.append(car.get('Number'))
+            manufacturers.append(car.get('Manufacturer'))
+            lap.extend([j.get('Lap') for j in car_laps])
+            lap_time.extend([j.get('LapTime') for j in car_laps])
+            lap_speed.extend([j.get('LapSpeed') for j in car_laps])
+            position.extend([j.get('RunningPos') for j in car_laps])
+
+        car_index = np.repeat(np.arange(len(cars)), counts)
+        return apply_schema(pd.DataFrame({
+            'driver_name': _repeat_categorical(drivers, car_index),
+            'car_number': _repeat_categorical(numbers, car_index),
+            'manufacturer': _repeat_categorical(manufacturers, car_index),
+            'Lap': _to_int(lap),
+            'lap_time': _to_timedelta(lap_time),
+            'lap_speed': _to_float(lap_speed),
+            'position': _to_int(position),
+        }), 'laps')
 
     @staticmethod
     def process_pit_stops(data: List[Dict[str, Any]]) -> pd.DataFrame:
@@ -200,7 +214,7 @@ class NASCARDataProcessor:
                 'positions_gained_lost': i.get('positions_gained_lost'),
             })
 
-        return pd.DataFrame(stops)
+        return apply_schema(pd.DataFrame(stops), 'pit_stops')
     
     @staticmethod
     def process_event_notes_data(data: Dict[str, Any]) -> pd.DataFrame:
@@ -223,7 +237,7 @@ class NASCARDataProcessor:
         if not lap_events.empty:
             lap_events['Flag'] = lap_events['Flag_State'].map(FLAG_CODE)
     
-        return pd.DataFrame(lap_events)
+        return apply_schema(pd.DataFrame(lap_events), 'events')
     
     @staticmethod
     def process_driver_data(data: Dict[str, Any]) -> pd.DataFrame:
@@ -251,7 +265,7 @@ class NASCARDataProcessor:
                 'laps': i.get('laps'),
                 'rating': i.get('rating'),
             })
-        return pd.DataFrame(driver_list)
+        return apply_schema(pd.DataFrame(driver_list), 'driver_stats')
     
     @staticmethod
     def process_adv_driver_data(data: Dict[str,Any]) -> pd.DataFrame:
@@ -276,7 +290,7 @@ class NASCARDataProcessor:
                 "quality_passes": vehicle.get("quality_passes"),
                 'position_differential_last_10_percent': vehicle.get('position_differential_last_10_percent'),
             })
-        return pd.DataFrame(driver_stats_advanced)
+        return apply_schema(pd.DataFrame(driver_stats_advanced), 'driver_stats_advanced')
 
 
 def _parse_practice_quali_number(name: str, practice: bool = True) -> int:
@@ -288,4 +302,30 @@ def _parse_practice_quali_number(name: str, practice: bool = True) -> int:
         if m:
             return int(m.group(1))
         else:
-            return 0
\ No newline at end of file
+            return 0
+
+
+def _repeat_categorical(values: List[Any], index: np.ndarray) -> pd.Categorical:
+    """Categorical of values[index] without building the repeated python objects."""
+    cat = pd.Categorical([None if v is None else str(v) for v in values])
+    return pd.Categorical.from_codes(cat.codes[index], categories=cat.categories)
+
+def _to_float(values: List[Any]) -> np.ndarray:
+    """Numbers, numeric strings and None straight to float64; falls back to pd.to_numeric for junk values."""
+    try:
+        return np.array(values, dtype='float64')
+    except (TypeError, ValueError):
+        return pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').to_numpy(dtype='float64')
+
+def _to_int(values: List[Any]) -> pd.arrays.IntegerArray:
+    return pd.array(_to_float(values), dtype='Int64')
+
+def _to_timedelta(values: List[Any]) -> np.ndarray:
+    """Lap times come as seconds (numbers or numeric strings); anything else goes through pd.to_timedelta."""
+    seconds = _to_float(values)
+    parsed = pd.to_timedelta(seconds, unit='s').to_numpy().copy()
+    unparsed = np.isnan(seconds) & pd.notna(np.array(values, dtype=object))
+    if unparsed.any():
+        raw = pd.Series(values, dtype=object)[unparsed]
+        parsed[unparsed] = pd.to_timedelta(raw, errors='coerce').to_numpy()
+    return parsed
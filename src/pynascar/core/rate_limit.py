@@ -0,0 +1,69 @@
+import threading
+import time
+from typing import Dict, Tuple
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket shared by every request of a client (thread safe).
+    The refill rate adapts to the server: each healthy response nudges it up towards max_rate,
+    a 429/5xx (or timeout) cuts it by decrease_factor and pauses everyone for the backoff delay.
+    """
+    def __init__(self, rate: float = 5.0, burst: int = 5, min_rate: float = 0.2, max_rate: float = 20.0,
+                 increase: float = 0.25, decrease_factor: float = 0.5):
+        if rate <= 0 or min_rate <= 0:
+            raise ValueError("rate and min_rate must be positive")
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, min_rate)
+        self.rate = min(max(rate, self.min_rate), self.max_rate)
+        self.burst = max(1, int(burst))
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """ Take a token (possibly going into debt) and return how long the caller must wait """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            deficit = -self._tokens if self._tokens < 0 else 0.0
+            return max(self._blocked_until - now, deficit / self.rate, 0.0)
+
+    def acquire(self) -> float:
+        """ Block until a request may be sent. Returns the seconds waited """
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def record_throttle(self, delay: float = 0.0) -> None:
+        """ Server pushed back. Slow down and hold all requests for `delay` seconds """
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            self._tokens = min(self._tokens, 0.0)
+            self._blocked_until = max(self._blocked_until, time.monotonic() + max(delay, 0.0))
+
+
+_shared_limiters: Dict[Tuple, AdaptiveRateLimiter] = {}
+_shared_lock = threading.Lock()
+
+def get_shared_rate_limiter(rate: float, burst: int, min_rate: float, max_rate: float) -> AdaptiveRateLimiter:
+    """
+    One limiter per distinct setting in this process, so separate NascarAPI instances
+    (e.g. a Race created without api_client) still share the same budget.
+    """
+    key = (rate, burst, min_rate, max_rate)
+    with _shared_lock:
+        limiter = _shared_limiters.get(key)
+        if limiter is None:
+            limiter = AdaptiveRateLimiter(rate=rate, burst=burst, min_rate=min_rate, max_rate=max_rate)
+            _shared_limiters[key] = limiter
+        return limiter
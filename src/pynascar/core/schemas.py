@@ -0,0 +1,217 @@
+from typing import Dict, Iterable, Optional
+import hashlib
+import json
+import pandas as pd
+
+# Compact dtypes for every processed table. Applied when the processor builds a frame
+# and again when it is read back from cache, so csv round trips come back typed as well.
+# Columns that are not listed (free text, lists) are left alone.
+
+_RESULTS = {
+    'driver_id': 'Int64',
+    'driver_name': 'category',
+    'car_number': 'category',
+    'manufacturer': 'category',
+    'sponsor': 'category',
+    'team': 'category',
+    'team_id': 'Int32',
+    'qualifying_order': 'Int16',
+    'qualifying_position': 'Int16',
+    'qualifying_speed': 'float32',
+    'starting_position': 'Int16',
+    'finishing_position': 'Int16',
+    'laps_completed': 'Int16',
+    'points': 'Int16',
+    'playoff_points': 'Int16',
+}
+
+_STAGE = {
+    'driver_id': 'Int64',
+    'driver_name': 'category',
+    'car_number': 'category',
+    'stage_number': 'Int8',
+    'position': 'Int16',
+    'stage_points': 'Int16',
+}
+
+_CAUTIONS = {
+    'start_lap': 'Int16',
+    'end_lap': 'Int16',
+    'caution_type': 'category',
+    'flag_state': 'Int8',
+}
+
+_LEAD_CHANGES = {
+    'start_lap': 'Int16',
+    'end_lap': 'Int16',
+    'driver_name': 'category',
+    'car_number': 'category',
+}
+
+_SESSION = {
+    'driver_id': 'Int64',
+    'driver_name': 'category',
+    'manufacturer': 'category',
+    'position': 'Int16',
+    'lap_time': 'float32',
+    'speed': 'float32',
+    'total_laps': 'Int16',
+    'delta_to_leader': 'float32',
+}
+_PRACTICE = {**_SESSION, 'practice_name': 'category', 'practice_number': 'Int8'}
+_QUALIFYING = {**_SESSION, 'qualifying_name': 'category', 'qualifying_number': 'Int8'}
+
+_LAPS = {
+    'driver_name': 'category',
+    'car_number': 'category',
+    'manufacturer': 'category',
+    'Lap': 'Int16',
+    'lap_time': 'timedelta64[ns]',
+    'lap_speed': 'float64',  # kept wide, the driver metrics average and rank on it
+    'position': 'Int16',
+    'driver_id': 'Int64',
+}
+
+_PIT_STOPS = {
+    'driver_name': 'category',
+    'lap': 'Int16',
+    'manufacturer': 'category',
+    'pit_in_flag_status': 'Int8',
+    'pit_out_flag_status': 'Int8',
+    'pit_in_race_time': 'float32',
+    'pit_out_race_time': 'float32',
+    'total_duration': 'float32',
+    'box_stop_race_time': 'float32',
+    'box_leave_race_time': 'float32',
+    'pit_stop_duration': 'float32',
+    'in_travel_duration': 'float32',
+    'out_travel_duration': 'float32',
+    'pit_stop_type': 'category',
+    'left_front_tire_changed': 'boolean',
+    'left_rear_tire_changed': 'boolean',
+    'right_front_tire_changed': 'boolean',
+    'right_rear_tire_changed': 'boolean',
+    'previous_lap_time': 'float32',
+    'next_lap_time': 'float32',
+    'pit_in_rank': 'Int16',
+    'pit_out_rank': 'Int16',
+    'positions_gained_lost': 'Int16',
+    'driver_id': 'Int64',
+    'car_number': 'category',
+}
+
+_EVENTS = {
+    'Lap': 'Int16',
+    'Flag_State': 'Int8',
+    'Flag': 'category',
+}
+
+_DRIVER_STATS = {
+    'driver_id': 'Int64',
+    'driver_name': 'category',
+    'start_position': 'Int16',
+    'mid_position': 'Int16',
+    'position': 'Int16',
+    'closing_position': 'Int16',
+    'closing_laps_diff': 'Int16',
+    'best_position': 'Int16',
+    'worst_position': 'Int16',
+    'avg_position': 'float32',
+    'passes_green_flag': 'Int16',
+    'passing_diff': 'Int16',
+    'passed_green_flag': 'Int16',
+    'quality_passes': 'Int16',
+    'fast_laps': 'Int16',
+    'top15_laps': 'Int16',
+    'lead_laps': 'Int16',
+    'laps': 'Int16',
+    'rating': 'float32',
+}
+
+_DRIVER_STATS_ADVANCED = {
+    'driver_id': 'Int64',
+    'driver_name': 'category',
+    'car_number': 'category',
+    'manufacturer': 'category',
+    'sponsor_name': 'category',
+    'best_lap': 'Int16',
+    'best_lap_speed': 'float32',
+    'best_lap_time': 'float32',
+    'laps_position_improved': 'Int16',
+    'fastest_laps_run': 'Int16',
+    'passes_made': 'Int16',
+    'times_passed': 'Int16',
+    'passing_differential': 'Int16',
+    'quality_passes': 'Int16',
+    'position_differential_last_10_percent': 'Int16',
+}
+
+# Keyed by cache key (see caching.save_df) so load_df can look them up directly
+TABLE_SCHEMAS: Dict[str, Dict[str, str]] = {
+    'results': _RESULTS,
+    'stage_1_results': _STAGE,
+    'stage_2_results': _STAGE,
+    'stage_3_results': _STAGE,
+    'cautions': _CAUTIONS,
+    'lead_changes': _LEAD_CHANGES,
+    'practice': _PRACTICE,
+    'qualifying': _QUALIFYING,
+    'laps': _LAPS,
+    'pit_stops': _PIT_STOPS,
+    'events': _EVENTS,
+    'driver_stats': _DRIVER_STATS,
+    'driver_stats_advanced': _DRIVER_STATS_ADVANCED,
+}
+
+_BOOLEANS = {True: True, False: False, 'True': True, 'False': False, 'true': True, 'false': False,
+             1: True, 0: False, '1': True, '0': False}
+
+
+def get_schema(table: str) -> Optional[Dict[str, str]]:
+    return TABLE_SCHEMAS.get(table)
+
+
+def schema_version(tables: Iterable[str]) -> str:
+    """ Short hash of the schemas of `tables`, changes when a column or dtype is added, dropped or changed """
+    schemas = {t: TABLE_SCHEMAS.get(t) for t in sorted(tables)}
+    return hashlib.sha256(json.dumps(schemas, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+def _has_dtype(s: pd.Series, dtype: str) -> bool:
+    if dtype.startswith('timedelta'):
+        return pd.api.types.is_timedelta64_dtype(s.dtype)
+    return str(s.dtype) == dtype
+
+
+def _convert(s: pd.Series, dtype: str) -> pd.Series:
+    if dtype == 'category':
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            return s
+        # Mixed int/str values (car numbers) are stored as strings so every source agrees
+        return s.where(s.isna(), s.astype(str)).astype('category')
+    if dtype == 'boolean':
+        if pd.api.types.is_bool_dtype(s.dtype):
+            return s.astype('boolean')
+        return s.map(_BOOLEANS).astype('boolean')
+    if dtype.startswith('timedelta'):
+        return pd.to_timedelta(s, errors='coerce')
+    numeric = pd.to_numeric(s, errors='coerce')
+    try:
+        return numeric.astype(dtype)
+    except (TypeError, ValueError):
+        # Fractional values in an integer column, keep them rather than truncate
+        return numeric
+
+
+def apply_schema(df: pd.DataFrame, table: str) -> pd.DataFrame:
+    """
+    Cast the columns of `df` listed in the schema of `table` in place and return it.
+    Unknown tables, missing columns and empty frames are passed through.
+    """
+    schema = TABLE_SCHEMAS.get(table)
+    if schema is None or df is None or df.empty:
+        return df
+    for col, dtype in schema.items():
+        if col in df.columns and not _has_dtype(df[col], dtype):
+            df[col] = _convert(df[col], dtype)
+    return df
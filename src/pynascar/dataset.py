@@ -0,0 +1,208 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+import pandas as pd
+
+from .caching import cache_format, list_cached_races, load_df, race_frame_path, sql_read_table
+from .config import get_settings
+from .core.schemas import apply_schema, get_schema
+from .schedule import Schedule
+from .utils import as_int_set
+
+# One table (laps, pit_stops, results, ...) across every cached race.
+# The race cache is laid out <cache_dir>/<year>/<series_id>/<race_id>/<key>.parquet, so in parquet (and arrow)
+# format it is read as a pyarrow dataset partitioned on those three directories: races are picked from the
+# cache index before any file is opened, and column projection and row filters are pushed into the scan.
+# In sqlite format the rows come from one query on the race_<key> table.
+# csv and bundle caches are read race by race and filtered afterwards.
+
+PARTITION_COLUMNS = ['year', 'series_id', 'race_id']
+
+
+def cached_race_files(key: str, years=None, series_ids=None, race_ids=None, fmt: str | None = None) -> List[Tuple[int, int, int, Path]]:
+    """
+    (year, series_id, race_id, path) of every cached race holding `key`, pruned on the partition values.
+    The path is the race.bundle in bundle format and the database in sqlite format.
+    Races come from the cache index, no directory is listed.
+    """
+    fmt = cache_format(fmt)
+    years, series_ids, race_ids = as_int_set(years), as_int_set(series_ids), as_int_set(race_ids)
+    files = []
+    for year, series_id, race_id in list_cached_races(key=key, fmt=fmt):
+        if (years is None or year in years) and (series_ids is None or series_id in series_ids) \
+                and (race_ids is None or race_id in race_ids):
+            path = race_frame_path(key, year=year, series_id=series_id, race_id=race_id, fmt=fmt)
+            files.append((year, series_id, race_id, path))
+    return files
+
+
+def _track_type_race_ids(years, series_ids, track_types, api_client=None) -> set:
+    """ (year, series_id, race_id) of the races run on `track_types`, from the season schedules """
+    track_types = {track_types} if isinstance(track_types, str) else set(track_types)
+    keys = set()
+    for year, series_id in sorted({(y, s) for y, s in zip(years, series_ids)}):
+        data = Schedule(year, series_id, use_cache=True, api_client=api_client).data
+        if data.empty or 'track_type' not in data.columns:
+            continue
+        for race_id in data.loc[data['track_type'].isin(track_types), 'race_id']:
+            keys.add((year, series_id, int(race_id)))
+    return keys
+
+
+def _to_expression(filters):
+    """ pyarrow Expression, or DNF tuples as in pandas.read_parquet ([('lap_speed', '>', 150), ...]) """
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    if filters is None or isinstance(filters, ds.Expression):
+        return filters
+    return pq.filters_to_expression(filters)
+
+
+def _partition_schema():
+    import pyarrow as pa
+    return pa.schema([(c, pa.int32()) for c in PARTITION_COLUMNS])
+
+
+def _read_schema(path: str, fmt: str):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    if fmt == "arrow":
+        with pa.memory_map(path) as source:
+            return pa.ipc.open_file(source).schema
+    return pq.read_schema(path)
+
+
+def _arrow_type(dtype: str):
+    """ pyarrow type of a core.schemas dtype """
+    import pyarrow as pa
+    if dtype == 'category':
+        return pa.dictionary(pa.int32(), pa.string())
+    return pa.Schema.from_pandas(pd.DataFrame({'c': pd.Series(dtype=dtype)}), preserve_index=False).field('c').type
+
+
+def _dataset_schema(key: str, paths: List[str], fmt: str):
+    """
+    Schema of the scan from one file, the newest race: races only gained columns over the years, and pyarrow
+    fills the columns a file lacks with nulls. A column that is all null there takes its type from
+    core.schemas, or from the first other file that has values when it is not listed.
+    """
+    import pyarrow as pa
+    schema = _read_schema(paths[-1], fmt)
+    dtypes = get_schema(key) or {}
+    untyped = set()
+    for i, field in enumerate(schema):
+        if pa.types.is_null(field.type):
+            if field.name in dtypes:
+                schema = schema.set(i, pa.field(field.name, _arrow_type(dtypes[field.name])))
+            else:
+                untyped.add(field.name)
+    for path in reversed(paths[:-1]):
+        if not untyped:
+            break
+        other = _read_schema(path, fmt)
+        for name in list(untyped):
+            i = other.get_field_index(name)
+            if i >= 0 and not pa.types.is_null(other.field(i).type):
+                schema = schema.set(schema.get_field_index(name), other.field(i))
+                untyped.discard(name)
+    return pa.unify_schemas([schema, _partition_schema()]).remove_metadata()
+
+
+def _scan_files(key, files, columns, expression, fmt) -> pd.DataFrame:
+    import pyarrow.dataset as ds
+
+    paths = [str(f[3]) for f in files]
+    schema = _dataset_schema(key, paths, fmt)
+    dataset = ds.dataset(paths, schema=schema, format="ipc" if fmt == "arrow" else "parquet",
+                         partitioning=ds.partitioning(_partition_schema()),
+                         partition_base_dir=str(get_settings().cache_dir))
+    if columns is not None:
+        columns = PARTITION_COLUMNS + [c for c in columns if c in schema.names and c not in PARTITION_COLUMNS]
+    return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+
+def _filter(df: pd.DataFrame, columns, expression) -> pd.DataFrame:
+    import pyarrow as pa
+
+    if expression is not None:
+        df = pa.Table.from_pandas(df, preserve_index=False).filter(expression).to_pandas()
+    if columns is not None:
+        df = df[PARTITION_COLUMNS + [c for c in columns if c in df.columns and c not in PARTITION_COLUMNS]]
+    return df
+
+
+def _scan_sql(key, files, columns, expression) -> pd.DataFrame:
+    # Only the wanted columns are selected unless a filter may need the others
+    df = sql_read_table(key, [f[:3] for f in files], columns if expression is None else None)
+    if df.empty:
+        return pd.DataFrame()
+    df[PARTITION_COLUMNS] = df[PARTITION_COLUMNS].astype('int32')
+    return _filter(apply_schema(df, key), columns, expression)
+
+
+def _scan_frames(key, files, columns, expression, fmt) -> pd.DataFrame:
+    frames = []
+    for year, series_id, race_id, _ in files:
+        df = load_df(key, year=year, series_id=series_id, race_id=race_id, fmt=fmt)
+        if df is None or df.empty:
+            continue
+        frames.append(df.assign(year=year, series_id=series_id, race_id=race_id))
+    if not frames:
+        return pd.DataFrame()
+    df = pd.concat(frames, ignore_index=True)
+    df[PARTITION_COLUMNS] = df[PARTITION_COLUMNS].astype('int32')
+    return _filter(df, columns, expression)
+
+
+def load_dataset(
+    key: str,
+    columns: Optional[Iterable[str]] = None,
+    years=None,
+    series_ids=None,
+    race_ids=None,
+    track_types=None,
+    filters=None,
+    fmt: str | None = None,
+    api_client=None
+) -> pd.DataFrame:
+    """
+    Table `key` of every cached race as one DataFrame with year, series_id and race_id columns first.
+    Only races already in the cache are read, nothing is fetched for them.
+
+    columns: only read these columns (the partition columns are always included)
+    years, series_ids, race_ids: a value or list of values, races outside them are never opened
+    track_types: e.g. 'intermediate', races are picked from the season schedules (schedule cache,
+        fetched once with api_client when a season is not cached yet)
+    filters: row filter pushed into the scan, a pyarrow Expression or DNF tuples like
+        [('lap_speed', '>', 150)]. Partition columns can be used as well.
+
+    e.g. lap speeds of the Cup series, 2023-2025, intermediates only:
+        load_dataset('laps', columns=['driver_id', 'Lap', 'lap_speed'], years=range(2023, 2026),
+                     series_ids=1, track_types='intermediate')
+    """
+    s = get_settings()
+    if not (s.cache_enabled and s.df_cache_enabled):
+        return pd.DataFrame()
+    fmt = cache_format(fmt)
+    files = cached_race_files(key, years, series_ids, race_ids, fmt)
+    if files and track_types is not None:
+        keep = _track_type_race_ids([f[0] for f in files], [f[1] for f in files], track_types, api_client)
+        files = [f for f in files if f[:3] in keep]
+    if not files:
+        return pd.DataFrame()
+
+    columns = None if columns is None else [columns] if isinstance(columns, str) else list(columns)
+    expression = _to_expression(filters)
+    if fmt in ("parquet", "arrow"):
+        try:
+            df = _scan_files(key, files, columns, expression, fmt)
+        except ImportError as e:
+            raise RuntimeError(f"Reading the {fmt} dataset needs 'pyarrow'.") from e
+    elif fmt == "sqlite":
+        df = _scan_sql(key, files, columns, expression)
+    else:
+        df = _scan_frames(key, files, columns, expression, fmt)
+    if df.empty:
+        return df
+    df = df[PARTITION_COLUMNS + [c for c in df.columns if c not in PARTITION_COLUMNS]]
+    return apply_schema(df, key)
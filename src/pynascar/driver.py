@@ -1,15 +1,105 @@
 from __future__ import annotations
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
+from itertools import repeat
 from typing import Dict, Optional, List
 import pandas as pd
 import math
 import time
+import weakref
 
-from .caching import load_df, load_drivers_df, save_drivers_df
+from .caching import has_df, load_drivers_df, save_drivers_df, save_schedule
 from .schedule import Schedule
 from .race import Race
-
-@dataclass
+from .core.base_api import NascarAPI
+from .core.process_data import PROCESSOR_VERSION
+from .core.schemas import apply_schema
+from .workers import process_pool, task_done, worker_api
+from .core.metrics import (compute_race_metrics, driver_info, metrics_records, aggregate_season_stats,
+                           DRIVER_INFO_COLUMNS)
+
+# Race -> (frame ids, field metrics) so add_race_data for each driver of a race computes them once
+_race_metrics_cache = weakref.WeakKeyDictionary()
+
+def _race_metrics(race: Race):
+    """({driver_id: metrics}, {driver_id: info}, pit stops of the race)"""
+    frames = (race.results.results, race.results.stage_1, race.results.stage_2, race.results.stage_3,
+              race.driver_data.drivers, race.driver_data.driver_stats_advanced,
+              race.telemetry.lap_times, race.telemetry.pit_stops)
+    key = tuple(id(f) for f in frames)
+    cached = _race_metrics_cache.get(race)
+    if cached is None or cached[0] != key:
+        cached = (key, (metrics_records(compute_race_metrics(race)),
+                        driver_info(race.results.results),
+                        race.telemetry.pit_stops))
+        _race_metrics_cache[race] = cached
+    return cached[1]
+
+def _load_race_metrics(race_id: int, year: int, series_id: int, use_cache_only: bool, reload_cache: bool,
+                       sleep_seconds: int, api: NascarAPI):
+    """Load one race and compute its field metrics. None when the race is skipped."""
+    try:
+        # Check cache first. Cached races are loaded cache first and only missing pieces are fetched
+        results_cached = has_df("results", year=year, series_id=series_id, race_id=race_id)
+        if not results_cached and use_cache_only:
+            return None
+
+        race = Race(year, series_id, race_id, live=False, reload=reload_cache, api_client=api,
+                    cache_only=use_cache_only and not reload_cache)
+
+        should_reload = reload_cache or not results_cached
+        if should_reload and sleep_seconds > 0:
+            time.sleep(sleep_seconds)
+
+        # Process drivers from results (driver_id already clean)
+        res = race.results.results
+        if res.empty or 'driver_id' not in res.columns:
+            return None
+
+        # Every driver's metrics in one pass over the race tables
+        return _race_metrics(race)
+
+    except Exception as e:
+        print(f"Error processing race {race_id}: {e}")
+        return None
+
+def _worker_race_metrics(race_id: int, year: int, series_id: int, use_cache_only: bool, reload_cache: bool,
+                         sleep_seconds: int):
+    try:
+        return _load_race_metrics(race_id, year, series_id, use_cache_only, reload_cache, sleep_seconds, worker_api())
+    finally:
+        task_done()
+
+def _finished_race_ids(year: int, series_id: int, offline: bool, api: NascarAPI) -> List[int]:
+    """
+    The schedule is refetched every time so races finished since the last build are picked up.
+    The cached copy is only used when the fetch fails or offline is set.
+    """
+    schedule = None
+    if not offline:
+        schedule = Schedule(year, series_id, use_cache=False, api_client=api)
+        if not schedule.data.empty:
+            save_schedule(schedule.data, year=year, series_id=series_id)
+    if schedule is None or schedule.data.empty:
+        schedule = Schedule(year, series_id, use_cache=True, api_client=api, cache_only=True)
+    finished_races = schedule.get_finished_races()
+    if finished_races is None or finished_races.empty:
+        return []
+    race_id_col = 'race_id' if 'race_id' in finished_races.columns else 'id'
+    return pd.to_numeric(finished_races[race_id_col], errors='coerce').dropna().astype(int).tolist()
+
+def _race_pit_stops(pit_stops: pd.DataFrame, race_id: int) -> pd.DataFrame:
+    """Pit stops of one race tagged with its race_id, the chunk the season tables are built from"""
+    if pit_stops is None or pit_stops.empty or 'driver_id' not in pit_stops.columns:
+        return pd.DataFrame()
+    return pit_stops[pit_stops['driver_id'].notna()].assign(race_id=race_id)
+
+def _with_str_car_number(df: pd.DataFrame) -> pd.DataFrame:
+    # csv reads car numbers back as ints
+    if 'car_number' in df.columns:
+        df['car_number'] = df['car_number'].where(df['car_number'].isna(), df['car_number'].astype(str))
+    return df
+
+@dataclass(init=False)
 class Driver:
     """Streamlined driver class with clean, normalized data."""
     driver_id: int
@@ -18,28 +108,64 @@ class Driver:
     car_number: Optional[str] = None
     manufacturer: Optional[str] = None
     race_data: Dict[int, Dict] = field(default_factory=dict)  # race_id -> metrics
-    pit_stops_df: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+    def __init__(self, driver_id: int, name: Optional[str] = None, team: Optional[str] = None,
+                 car_number: Optional[str] = None, manufacturer: Optional[str] = None,
+                 race_data: Optional[Dict[int, Dict]] = None, pit_stops_df: Optional[pd.DataFrame] = None):
+        self.driver_id = driver_id
+        self.name = name
+        self.team = team
+        self.car_number = car_number
+        self.manufacturer = manufacturer
+        self.race_data = {} if race_data is None else race_data
+        # Drivers of a DriversData read their pit stops from the season table instead (see DriversData._driver).
+        # Plain attributes, not fields, so asdict and the comparisons never walk back into the season
+        self._season: Optional[DriversData] = None
+        # One chunk per race, concatenated on first access
+        self._pit_stop_chunks: List[pd.DataFrame] = []
+        self.pit_stops_df = pit_stops_df
+
+    @property
+    def pit_stops_df(self) -> pd.DataFrame:
+        """All pit stops of the driver, with race_id."""
+        if self._season is not None:
+            return self._season.driver_pit_stops(self.driver_id)
+        if not self._pit_stop_chunks:
+            return pd.DataFrame()
+        if len(self._pit_stop_chunks) > 1:
+            self._pit_stop_chunks = [pd.concat(self._pit_stop_chunks, ignore_index=True)]
+        return self._pit_stop_chunks[0]
+
+    @pit_stops_df.setter
+    def pit_stops_df(self, df: Optional[pd.DataFrame]) -> None:
+        if self._season is not None:
+            raise AttributeError("Pit stops of a DriversData driver come from its season table (DriversData.pit_stops)")
+        self._pit_stop_chunks = [] if df is None or df.empty else [df]
 
     def add_race_data(self, race: Race, race_id: int) -> None:
         """Extract all driver data from a Race object."""
-        race_metrics = {'race_id': race_id}
-
-        # Basic results and driver info
-        self._add_results_data(race, race_metrics)
-        
-        # Stage results  
-        self._add_stage_data(race, race_metrics)
-        
-        # Driver performance stats
-        self._add_driver_stats(race, race_metrics)
-        
-        # Lap analysis
-        self._add_lap_analysis(race, race_metrics)
-        
-        # Pit stops
-        self._add_pit_data(race, race_id, race_metrics)
+        metrics, info, pit_stops = _race_metrics(race)
+        pit_stops = _race_pit_stops(pit_stops, race_id)
+        if not pit_stops.empty:
+            pit_stops = pit_stops[pit_stops['driver_id'] == self.driver_id]
+        self.add_race_metrics(race_id, metrics.get(self.driver_id, {}), info.get(self.driver_id), pit_stops)
+
+    def add_race_metrics(self, race_id: int, metrics: Dict, info: Optional[Dict] = None,
+                         pit_stops: Optional[pd.DataFrame] = None) -> None:
+        """Store the metrics of one race, computed for the whole field by core.metrics."""
+        # Update driver info from latest race data
+        if info:
+            for attr, col in [('name', 'driver_name'), ('team', 'team'),
+                             ('car_number', 'car_number'), ('manufacturer', 'manufacturer')]:
+                val = info.get(col)
+                if pd.notna(val) and str(val).strip():
+                    setattr(self, attr, val)
+
+        if pit_stops is not None and not pit_stops.empty:
+            self._pit_stop_chunks.append(pit_stops)
 
         # Store with current driver info
+        race_metrics = {'race_id': race_id, **metrics}
         race_metrics.update({
             'driver_name': self.name,
             'team': self.team,
@@ -48,143 +174,14 @@ class Driver:
         })
         self.race_data[race_id] = race_metrics
 
-    def _add_results_data(self, race: Race, race_metrics: dict) -> None:
-        """Add basic results data and update driver info."""
-        res = race.results.results
-        if res.empty or 'driver_id' not in res.columns:
-            return
-
-        driver_row = res[res['driver_id'] == self.driver_id]
-        if driver_row.empty:
-            return
-
-        row = driver_row.iloc[0]
-        
-        # Update driver info from latest race data
-        for attr, col in [('name', 'driver_name'), ('team', 'team'), 
-                         ('car_number', 'car_number'), ('manufacturer', 'manufacturer')]:
-            val = row.get(col)
-            if pd.notna(val) and str(val).strip():
-                setattr(self, attr, val)
-
-        # Add race results (all already normalized in race.py)
-        for col in ['finishing_position', 'starting_position', 'laps_completed', 
-                   'points', 'playoff_points', 'qualifying_position', 'qualifying_speed']:
-            race_metrics[col] = row.get(col)
-
-    def _add_stage_data(self, race: Race, race_metrics: dict) -> None:
-        """Add stage results (already have race_id and driver_id)."""
-        for stage_num in [1, 2, 3]:
-            stage_df = getattr(race.results, f'stage_{stage_num}', pd.DataFrame())
-            if not stage_df.empty and 'driver_id' in stage_df.columns:
-                stage_row = stage_df[stage_df['driver_id'] == self.driver_id]
-                if not stage_row.empty:
-                    s = stage_row.iloc[0]
-                    race_metrics[f'stage{stage_num}_position'] = s.get('finishing_position', s.get('position'))
-                    race_metrics[f'stage{stage_num}_points'] = s.get('points')
-
-    def _add_driver_stats(self, race: Race, race_metrics: dict) -> None:
-        """Add driver performance stats (already normalized)."""
-        if not hasattr(race, 'driver_data'):
-            return
-            
-        # Basic driver stats
-        if hasattr(race.driver_data, 'drivers') and not race.driver_data.drivers.empty:
-            stats_row = race.driver_data.drivers[race.driver_data.drivers['driver_id'] == self.driver_id]
-            if not stats_row.empty:
-                row = stats_row.iloc[0]
-                for col in row.index:
-                    if col not in ['driver_id', 'race_id', 'driver_name'] and pd.notna(row[col]):
-                        race_metrics[col] = row[col]
-
-        # Advanced stats
-        adv_df = getattr(race.driver_data, 'driver_stats_advanced', pd.DataFrame())
-        if not adv_df.empty and 'driver_id' in adv_df.columns:
-            adv_row = adv_df[adv_df['driver_id'] == self.driver_id]
-            if not adv_row.empty:
-                row = adv_row.iloc[0]
-                for col in row.index:
-                    if col not in ['driver_id', 'race_id', 'driver_name'] and pd.notna(row[col]):
-                        race_metrics[col] = row[col]
-
-    def _add_lap_analysis(self, race: Race, race_metrics: dict) -> None:
-        """Add lap-based metrics (already has driver_id mapping)."""
-        laps_df = race.telemetry.lap_times.copy()
-        if laps_df.empty or 'driver_id' not in laps_df.columns:
-            return
-
-        # Filter to this driver (driver_id already mapped in race.py)
-        driver_laps = laps_df[laps_df['driver_id'] == self.driver_id]
-        if driver_laps.empty:
-            return
-
-        # Calculate basic metrics
-        race_metrics.update({
-            "avg_lap_speed": driver_laps["lap_speed"].mean(),
-            "fastest_lap": driver_laps["lap_speed"].max(),
-            "total_laps": driver_laps["Lap"].max()
-        })
-        
-        # Leader laps calculation
-        laps_df["lap_speed_max"] = laps_df.groupby("Lap")["lap_speed"].transform("max")
-        leader_laps = (driver_laps["lap_speed"] == laps_df.loc[driver_laps.index, "lap_speed_max"]).sum()
-        race_metrics["leader_laps"] = int(leader_laps)
-        
-        # Average speed rank
-        laps_df["speed_rank"] = laps_df.groupby("Lap")["lap_speed"].rank(ascending=False, method="min")
-        race_metrics["avg_speed_rank"] = laps_df[laps_df["driver_id"] == self.driver_id]["speed_rank"].mean()
-
-    def _add_pit_data(self, race: Race, race_id: int, race_metrics: dict) -> None:
-        """Add pit stop data (already has driver_id and race_id)."""
-        pit_df = race.telemetry.pit_stops
-        if pit_df.empty or 'driver_id' not in pit_df.columns:
-            return
-
-        # Filter to this driver (driver_id already mapped in race.py)
-        driver_pits = pit_df[pit_df["driver_id"] == self.driver_id].copy()
-        if not driver_pits.empty:
-            # Store pit stops (race_id already added in race.py)
-            self.pit_stops_df = pd.concat([self.pit_stops_df, driver_pits], ignore_index=True)
-            
-            # Add race metrics
-            race_metrics["total_pit_stops"] = len(driver_pits)
-            
-            # Find pit time column and calculate average
-            pit_time_cols = ["pit_time", "Pit Time", "total_duration"]
-            pit_time_col = next((c for c in pit_time_cols if c in driver_pits.columns), None)
-            if pit_time_col:
-                race_metrics["avg_pit_time"] = pd.to_numeric(driver_pits[pit_time_col], errors="coerce").mean()
-
     def compute_season_stats(self) -> pd.Series:
         """Compute season-level statistics."""
         if not self.race_data:
             return pd.Series(dtype="float64")
 
-        df = pd.DataFrame(list(self.race_data.values()))
-        numeric_cols = df.select_dtypes(include=['number']).columns
-        
-        # Basic averages
-        stats = df[numeric_cols].mean()
-        
-        # Special calculations
-        stats['total_races'] = len(self.race_data)
-        
-        if 'points' in df.columns:
-            stats['total_points'] = df['points'].sum()
-        if 'playoff_points' in df.columns:
-            stats['total_playoff_points'] = df['playoff_points'].sum()
-        if 'finishing_position' in df.columns:
-            stats['wins'] = (df['finishing_position'] == 1).sum()
-            stats['top5s'] = (df['finishing_position'] <= 5).sum()
-            stats['top10s'] = (df['finishing_position'] <= 10).sum()
-        if 'leader_laps' in df.columns:
-            stats['total_leader_laps'] = df['leader_laps'].sum()
-        if 'passes_green_flag' in df.columns:
-            stats['total_passes_green_flag'] = df['passes_green_flag'].sum()
-        if 'passed_green_flag' in df.columns:
-            stats['total_passed_green_flag'] = df['passed_green_flag'].sum()
-
-        return stats
+        df = pd.DataFrame(list(self.race_data.values())).assign(driver_id=self.driver_id)
+        stats = aggregate_season_stats(df).iloc[0]
+        return stats.drop(['driver_id', *DRIVER_INFO_COLUMNS], errors='ignore')
 
     def to_dict(self) -> Dict:
         """Convert to dictionary for DataFrame creation."""
@@ -207,6 +204,17 @@ class DriversData:
     series_id: int
     drivers: Dict[int, Driver] = field(default_factory=dict)
     race_ids: List[int] = field(default_factory=list)
+    # Races whose metrics are folded into drivers, update() skips these
+    processed_race_ids: List[int] = field(default_factory=list)
+    # Per race pit stop chunks, concatenated once into the season table (see pit_stops)
+    _pit_chunks: List[pd.DataFrame] = field(default_factory=list, init=False, repr=False)
+    _pit_table: Optional[pd.DataFrame] = field(default=None, init=False, repr=False)
+    # Long format table (see table) and its row positions / columns per race and driver
+    _table: Optional[pd.DataFrame] = field(default=None, init=False, repr=False)
+    _race_columns: Dict[int, List[str]] = field(default_factory=dict, init=False, repr=False)
+    _race_rows: Dict[int, List[int]] = field(default_factory=dict, init=False, repr=False)
+    _driver_rows: Dict[int, List[int]] = field(default_factory=dict, init=False, repr=False)
+    _slices: Dict = field(default_factory=dict, init=False, repr=False)
 
     @classmethod
     def build(
@@ -214,61 +222,189 @@ class DriversData:
         year: int,
         series_id: int,
         use_cache_only: bool = True,
-        sleep_seconds: int = 10,
-        reload_cache: bool = False
+        sleep_seconds: int = 0,
+        reload_cache: bool = False,
+        api_client: Optional[NascarAPI] = None,
+        workers: Optional[int] = None,
+        offline: bool = False
     ) -> 'DriversData':
-        """Build DriversData for a season."""
+        """
+        Build DriversData for a season.
+        Requests are paced by the API client's adaptive rate limiter, sleep_seconds only adds
+        an extra fixed pause after each fetched race.
+        workers > 1 loads and processes the races in that many processes (cache decode and
+        pandas work is CPU bound). Results are merged in race order, same as a serial build.
+        The season state is saved to the cache, see load() and update().
+        The schedule is always refetched unless offline=True, which also implies use_cache_only.
+        """
+        use_cache_only = use_cache_only or offline
         instance = cls(year=year, series_id=series_id)
+        # One client for the whole season so every race reuses the same pooled connections
+        api = api_client or NascarAPI()
 
         # Get finished races
-        schedule = Schedule(year, series_id)
-        finished_races = schedule.get_finished_races()
-        if finished_races is None or finished_races.empty:
+        race_ids = _finished_race_ids(year, series_id, offline, api)
+        if not race_ids:
             return instance
-
-        race_id_col = 'race_id' if 'race_id' in finished_races.columns else 'id'
-        race_ids = pd.to_numeric(finished_races[race_id_col], errors='coerce').dropna().astype(int).tolist()
         instance.race_ids = race_ids
 
-        # Process each race
-        for race_id in race_ids:
-            try:
-                # Check cache first
-                results_cached = load_df("results", year=year, series_id=series_id, race_id=race_id)
-                if (results_cached is None or results_cached.empty) and use_cache_only:
-                    continue
-
-                should_reload = reload_cache or (results_cached is None or results_cached.empty)
-                race = Race(year, series_id, race_id, live=False, reload=should_reload)
-                
-                if should_reload and sleep_seconds > 0:
-                    time.sleep(sleep_seconds)
-
-                # Process drivers from results (driver_id already clean)
-                res = race.results.results
-                if res.empty or 'driver_id' not in res.columns:
-                    continue
-
-                driver_ids = pd.to_numeric(res['driver_id'], errors='coerce').dropna().astype(int).unique()
-                
-                for driver_id in driver_ids:
-                    if driver_id not in instance.drivers:
-                        instance.drivers[driver_id] = Driver(driver_id=driver_id)
-                    instance.drivers[driver_id].add_race_data(race, race_id)
-
-            except Exception as e:
-                print(f"Error processing race {race_id}: {e}")
-                continue
+        instance._add_races(race_ids, use_cache_only, sleep_seconds, reload_cache, api, workers)
+        instance.save()
+        return instance
 
+    @classmethod
+    def load(cls, year: int, series_id: int) -> Optional['DriversData']:
+        """Season state saved by build()/update(), None if there is none or it was built by another processor version."""
+        key = dict(year=year, series_id=series_id)
+        races = load_drivers_df(name="races", **key)
+        if races is None:
+            return None
+        # States saved before the version column existed count as version 1
+        version = int(races['processor_version'].iloc[0]) if 'processor_version' in races.columns and not races.empty else 1
+        if version != PROCESSOR_VERSION:
+            return None
+        instance = cls(year=year, series_id=series_id,
+                       race_ids=races['race_id'].astype(int).tolist(),
+                       processed_race_ids=races.loc[races['processed'].astype(bool), 'race_id'].astype(int).tolist())
+
+        info = load_drivers_df(name="drivers", **key)
+        if info is not None:
+            for row in _with_str_car_number(info).to_dict('records'):
+                driver = Driver(driver_id=int(row['driver_id']))
+                for attr in ('name', 'team', 'car_number', 'manufacturer'):
+                    val = row.get(attr)
+                    setattr(driver, attr, None if pd.isna(val) else val)
+                instance.drivers[driver.driver_id] = driver
+
+        metrics = load_drivers_df(name="race_metrics", **key)
+        if metrics is not None and not metrics.empty:
+            for race_id, rows in _with_str_car_number(metrics).groupby('race_id', sort=False):
+                # Columns this race never had (e.g. stage 3) were only filled in by the other races
+                for row in rows.dropna(axis=1, how='all').to_dict('records'):
+                    driver_id = int(row.pop('driver_id'))
+                    row['race_id'] = int(race_id)
+                    instance._driver(driver_id).race_data[int(race_id)] = row
+
+        pit_stops = load_drivers_df(name="pit_stops", **key)
+        if pit_stops is not None and not pit_stops.empty:
+            instance._add_pit_stops(pit_stops)
+        for driver in instance.drivers.values():
+            driver._season = instance
         return instance
 
+    def save(self) -> None:
+        """Save the season state (drivers, per race metrics, pit stops, processed races) to the cache."""
+        key = dict(year=self.year, series_id=self.series_id)
+        processed = set(self.processed_race_ids)
+        save_drivers_df(pd.DataFrame({'race_id': self.race_ids,
+                                      'processed': [r in processed for r in self.race_ids],
+                                      'processor_version': PROCESSOR_VERSION}),
+                        name="races", **key)
+        save_drivers_df(pd.DataFrame([{'driver_id': d.driver_id, 'name': d.name, 'team': d.team,
+                                       'car_number': d.car_number, 'manufacturer': d.manufacturer}
+                                      for d in self.drivers.values()]), name="drivers", **key)
+        save_drivers_df(pd.DataFrame([{'driver_id': d.driver_id, **race_data}
+                                      for d in self.drivers.values() for race_data in d.race_data.values()]),
+                        name="race_metrics", **key)
+        save_drivers_df(self.pit_stops.reset_index(drop=True), name="pit_stops", **key)
+
+    def update(
+        self,
+        use_cache_only: bool = False,
+        sleep_seconds: int = 0,
+        api_client: Optional[NascarAPI] = None,
+        workers: Optional[int] = None,
+        offline: bool = False
+    ) -> List[int]:
+        """
+        Fold in the races finished since the last build/update and save the state.
+        Only the new races are loaded. Returns their race_ids.
+        offline=True uses the cached schedule and cached races only.
+
+        dd = DriversData.load(2025, 1) or DriversData.build(2025, 1, use_cache_only=False)
+        dd.update()
+        """
+        use_cache_only = use_cache_only or offline
+        api = api_client or NascarAPI()
+        finished = _finished_race_ids(self.year, self.series_id, offline, api)
+        processed = set(self.processed_race_ids)
+        new_race_ids = [race_id for race_id in finished if race_id not in processed]
+        # Same order as a fresh build (the schedule's)
+        self.race_ids = finished + [race_id for race_id in self.race_ids if race_id not in finished]
+
+        added = self._add_races(new_race_ids, use_cache_only, sleep_seconds, False, api, workers)
+        self.save()
+        return added
+
+    def _add_races(self, race_ids: List[int], use_cache_only: bool, sleep_seconds: int, reload_cache: bool,
+                   api: NascarAPI, workers: Optional[int]) -> List[int]:
+        """Load the races and fold their metrics into the drivers, in race order. Returns the race_ids added."""
+        if workers and workers > 1 and len(race_ids) > 1:
+            # Each process gets its own client, splitting the request budget between them
+            config = replace(api.config,
+                             requests_per_second=api.config.requests_per_second / workers,
+                             min_requests_per_second=api.config.min_requests_per_second / workers,
+                             max_requests_per_second=api.config.max_requests_per_second / workers,
+                             burst=max(1, api.config.burst // workers))
+            with process_pool(workers, config) as pool:
+                # map keeps race order whatever order the workers finish in
+                per_race = list(pool.map(_worker_race_metrics, race_ids,
+                                         repeat(self.year), repeat(self.series_id), repeat(use_cache_only),
+                                         repeat(reload_cache), repeat(sleep_seconds)))
+        else:
+            per_race = (_load_race_metrics(race_id, self.year, self.series_id, use_cache_only, reload_cache,
+                                           sleep_seconds, api) for race_id in race_ids)
+
+        added = []
+        for race_id, race_data in zip(race_ids, per_race):
+            if race_data is None:
+                continue
+            metrics, info, pit_stops = race_data
+            for driver_id, race_metrics in metrics.items():
+                self._driver(driver_id).add_race_metrics(race_id, race_metrics, info.get(driver_id))
+            self._add_pit_stops(_race_pit_stops(pit_stops, race_id))
+            added.append(race_id)
+        self.processed_race_ids.extend(added)
+        self._invalidate()
+        return added
+
+    def _driver(self, driver_id: int) -> Driver:
+        driver = self.drivers.get(driver_id)
+        if driver is None:
+            driver = self.drivers[driver_id] = Driver(driver_id=driver_id)
+            driver._season = self
+        return driver
+
+    def _add_pit_stops(self, pit_stops: pd.DataFrame) -> None:
+        if not pit_stops.empty:
+            self._pit_chunks.append(pit_stops)
+            self._pit_table = None
+
+    @property
+    def pit_stops(self) -> pd.DataFrame:
+        """
+        Pit stops of the whole season indexed by (driver_id, race_id).
+        The per race chunks are concatenated once, on first access after a change.
+        """
+        if self._pit_table is None:
+            if not self._pit_chunks:
+                return pd.DataFrame()
+            table = apply_schema(pd.concat(self._pit_chunks, ignore_index=True), "pit_stops")
+            table.index = pd.MultiIndex.from_arrays([table['driver_id'].astype(int), table['race_id'].astype(int)],
+                                                    names=['driver_id', 'race_id'])
+            self._pit_table = table.sort_index(kind='stable')
+            self._pit_chunks = [table]
+        return self._pit_table
+
     def to_dataframe(self, min_participation: float = 0.2) -> pd.DataFrame:
         """Convert to season summary DataFrame."""
         if not self.drivers:
             return pd.DataFrame()
 
-        rows = [driver.to_dict() for driver in self.drivers.values()]
-        df = pd.DataFrame(rows)
+        # One grouped pass over the season table
+        df = aggregate_season_stats(self.table)
+        if df.empty:
+            return df
 
         # Apply minimum participation filter
         if min_participation > 0 and self.race_ids:
@@ -277,62 +413,115 @@ class DriversData:
 
         return df
 
-    def race_dataframe(self, race_id: int) -> pd.DataFrame:
-        """Get DataFrame for a specific race."""
-        rows = []
-        for driver in self.drivers.values():
-            race_data = driver.race_data.get(race_id)
-            if race_data:
-                rows.append({
-                    'driver_id': driver.driver_id,
-                    'driver_name': driver.name,
-                    'team': driver.team,
-                    'car_number': driver.car_number,
-                    'manufacturer': driver.manufacturer,
-                    **race_data
-                })
-        
-        df = pd.DataFrame(rows)
-        if df.empty:
-            return df
-
-        # Add normalized speed
-        if 'avg_lap_speed' in df.columns and df['avg_lap_speed'].notna().any():
-            max_speed, min_speed = df['avg_lap_speed'].max(), df['avg_lap_speed'].min()
-            if max_speed != min_speed:
-                df['norm_speed'] = (df['avg_lap_speed'] - min_speed) / (max_speed - min_speed)
+    @property
+    def table(self) -> pd.DataFrame:
+        """
+        Long format season table, one row per (race_id, driver_id) in race order with norm_speed.
+        Materialized once and kept until races are added. race_dataframe, all_races_dataframe and
+        driver_season_dataframe are slices of it.
+        """
+        if self._table is None:
+            self._materialize()
+        return self._table
+
+    def _materialize(self) -> None:
+        rows, race_columns, race_rows, driver_rows = [], {}, {}, {}
+        race_ids = list(self.race_ids)
+        race_ids += sorted({r for d in self.drivers.values() for r in d.race_data} - set(race_ids))
+        for race_id in race_ids:
+            columns = {}
+            for driver in self.drivers.values():
+                race_data = driver.race_data.get(race_id)
+                if race_data:
+                    row = {
+                        'driver_id': driver.driver_id,
+                        'driver_name': driver.name,
+                        'team': driver.team,
+                        'car_number': driver.car_number,
+                        'manufacturer': driver.manufacturer,
+                        **race_data
+                    }
+                    columns.update(dict.fromkeys(row))
+                    race_rows.setdefault(race_id, []).append(len(rows))
+                    driver_rows.setdefault(driver.driver_id, []).append((race_id, len(rows)))
+                    rows.append(row)
+            race_columns[race_id] = list(columns)
+
+        table = pd.DataFrame(rows)
+        # Normalized speed within each race
+        if 'avg_lap_speed' in table.columns:
+            speed = pd.to_numeric(table['avg_lap_speed'], errors='coerce')
+            by_race = speed.groupby(table['race_id'])
+            lo, hi = by_race.transform('min'), by_race.transform('max')
+            table['norm_speed'] = ((speed - lo) / (hi - lo)).mask(hi == lo, 1.0)
+            # Races without rows (not cached with use_cache_only, or failed to load) have no speeds
+            for race_id, positions in race_rows.items():
+                if speed.iloc[positions].notna().any():
+                    race_columns[race_id].append('norm_speed')
+        if not table.empty:
+            table.index = pd.MultiIndex.from_arrays([table['race_id'], table['driver_id']],
+                                                    names=['race_id', 'driver_id'])
+
+        self._table = table
+        self._slices = {}
+        self._race_columns = race_columns
+        self._race_rows = race_rows
+        # A driver's races are listed by race_id
+        self._driver_rows = {d: [pos for _, pos in sorted(v)] for d, v in driver_rows.items()}
+
+    @staticmethod
+    def concat_tables(seasons: List['DriversData']) -> pd.DataFrame:
+        """
+        Per race tables of several seasons with year and series_id columns, e.g. for
+        aggregate_season_stats(DriversData.concat_tables([dd_2024, dd_2025]), by=('year', 'driver_id'))
+        """
+        tables = [dd.table.reset_index(drop=True).assign(year=dd.year, series_id=dd.series_id)
+                  for dd in seasons if not dd.table.empty]
+        return pd.concat(tables, ignore_index=True) if tables else pd.DataFrame()
+
+    def _invalidate(self) -> None:
+        """Drop the materialized table, the next query rebuilds it from Driver.race_data"""
+        self._table = None
+        self._slices = {}
+
+    def _slice(self, key, positions: List[int], columns: List[str]) -> pd.DataFrame:
+        """Rows of the table, kept per race/driver so repeated queries only pay for a copy"""
+        df = self._slices.get(key)
+        if df is None:
+            table = self.table
+            n = len(columns)
+            if list(table.columns[:n]) == columns:
+                # Usual case, every race has the same columns (norm_speed is last)
+                df = table.iloc[positions, :n]
             else:
-                df['norm_speed'] = 1.0
+                df = table.iloc[positions][columns]
+            df = self._slices[key] = df.reset_index(drop=True)
+        return df.copy()
 
-        return df
+    def race_dataframe(self, race_id: int) -> pd.DataFrame:
+        """Get DataFrame for a specific race."""
+        self.table
+        positions = self._race_rows.get(race_id)
+        if positions is None:
+            return pd.DataFrame()
+        return self._slice(('race', race_id), positions, self._race_columns[race_id])
 
     def all_races_dataframe(self) -> pd.DataFrame:
         """Get all races combined into single DataFrame."""
         if not self.race_ids:
             return pd.DataFrame()
-            
-        frames = [self.race_dataframe(race_id) for race_id in self.race_ids]
-        frames = [f for f in frames if not f.empty]
-        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        return self.table.reset_index(drop=True)
 
     def driver_season_dataframe(self, driver_id: int) -> pd.DataFrame:
         """Get all race data for a specific driver."""
-        driver = self.drivers.get(driver_id)
-        if not driver or not driver.race_data:
+        self.table
+        positions = self._driver_rows.get(driver_id)
+        if positions is None:
             return pd.DataFrame()
-
-        rows = []
-        for race_id, race_data in sorted(driver.race_data.items()):
-            rows.append({
-                'driver_id': driver_id,
-                'driver_name': driver.name,
-                'team': driver.team,
-                'car_number': driver.car_number,
-                'manufacturer': driver.manufacturer,
-                **race_data
-            })
-
-        return pd.DataFrame(rows)
+        race_ids = dict.fromkeys(r for r, d in self._table.index[positions])
+        columns = dict.fromkeys(c for race_id in race_ids for c in self._race_columns[race_id])
+        columns.pop('norm_speed', None)
+        return self._slice(('driver', driver_id), positions, list(columns))
 
     def get_driver(self, driver_id: int) -> Optional[Driver]:
         """Get specific driver."""
@@ -340,11 +529,8 @@ class DriversData:
 
     def driver_pit_stops(self, driver_id: int, race_id: Optional[int] = None) -> pd.DataFrame:
         """Get pit stops for a driver."""
-        driver = self.drivers.get(driver_id)
-        if not driver or driver.pit_stops_df.empty:
+        table = self.pit_stops
+        key = driver_id if race_id is None else (driver_id, race_id)
+        if table.empty or key not in table.index:
             return pd.DataFrame()
-            
-        df = driver.pit_stops_df.copy()
-        if race_id is not None:
-            df = df[df['race_id'] == race_id]
-        return df
\ No newline at end of file
+        return table.loc[[key]].reset_index(drop=True)
@@ -1,15 +1,20 @@
 # src/race.py
 
+import json
 import pandas as pd
 import requests
 import warnings
-from dataclasses import dataclass, field
-from typing import Optional, Dict, Any
+from dataclasses import dataclass, asdict, fields
+from functools import partial
+from typing import Optional, Dict, Any, Callable
 from .codes import FLAG_CODE, NAME_MAPPINGS
-from .caching import load_df, save_df
-from .core.base_api import NascarAPI
-from .core.process_data import NASCARDataProcessor
-from .utils import normalize_name
+from .caching import (load_df, load_dfs, save_dfs, has_df, load_manifest, record_race_endpoint, load_http_response,
+                      payload_digest, save_raw_payload, load_raw_payload)
+from .core.base_api import NascarAPI, RACE_ENDPOINTS
+from .core.async_api import AsyncNascarAPI
+from .core.process_data import NASCARDataProcessor, PROCESSOR_VERSION
+from .core.schemas import apply_schema, schema_version
+from .utils import normalize_names
 
 
 @dataclass
@@ -30,77 +35,359 @@ class RaceMetadata:
     restrictor_plate: Optional[bool] = None
     winner: Optional[str] = None
 
-@dataclass 
-class RaceResults:
+class _LazyFrames:
+    """
+    Base for the race containers. Frames are read (cache) or fetched (API) through the owning Race
+    the first time they are accessed and memoized on the instance after that.
+    """
+    _fields: tuple = ()
+
+    def __init__(self, loader: Optional[Callable[[str], None]] = None, **frames: pd.DataFrame):
+        unknown = set(frames) - set(self._fields)
+        if unknown:
+            raise TypeError(f"{type(self).__name__} got unexpected frames: {sorted(unknown)}")
+        self._loader = loader
+        for name, df in frames.items():
+            setattr(self, name, df)
+
+    def __getattr__(self, name: str) -> pd.DataFrame:
+        # Only reached when the frame has not been set yet
+        if name.startswith("_") or name not in type(self)._fields:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        loader = self.__dict__.get("_loader")
+        if loader is not None:
+            loader(name)
+        if name not in self.__dict__:
+            self.__dict__[name] = pd.DataFrame()
+        return self.__dict__[name]
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self.__dict__
+
+    def __repr__(self) -> str:
+        frames = ", ".join(
+            f"{f}={self.__dict__[f].shape if f in self.__dict__ else 'not loaded'}" for f in self._fields
+        )
+        return f"{type(self).__name__}({frames})"
+
+class RaceResults(_LazyFrames):
     """Container for race results data."""
-    results: pd.DataFrame = field(default_factory=pd.DataFrame)
-    stage_1: pd.DataFrame = field(default_factory=pd.DataFrame)
-    stage_2: pd.DataFrame = field(default_factory=pd.DataFrame)
-    stage_3: pd.DataFrame = field(default_factory=pd.DataFrame)
-    cautions: pd.DataFrame = field(default_factory=pd.DataFrame)
-    lead_changes: pd.DataFrame = field(default_factory=pd.DataFrame)
-    practice: pd.DataFrame = field(default_factory=pd.DataFrame)
-    qualifying: pd.DataFrame = field(default_factory=pd.DataFrame)
+    _fields = ("results", "stage_1", "stage_2", "stage_3", "cautions", "lead_changes", "practice", "qualifying")
 
-@dataclass
-class RaceTelemetry:
+class RaceTelemetry(_LazyFrames):
     """Container for race telemetry data."""
-    lap_times: pd.DataFrame = field(default_factory=pd.DataFrame)
-    pit_stops: pd.DataFrame = field(default_factory=pd.DataFrame)
-    events: pd.DataFrame = field(default_factory=pd.DataFrame)
+    _fields = ("lap_times", "pit_stops", "events")
 
-@dataclass
-class RaceDriverData:
+class RaceDriverData(_LazyFrames):
     """Container for race telemetry data."""
-    drivers: pd.DataFrame = field(default_factory=pd.DataFrame)
-    driver_stats_advanced: pd.DataFrame = field(default_factory=pd.DataFrame)
-
+    _fields = ("drivers", "driver_stats_advanced")
+
+# (container, frame) -> (cache key, endpoint that produces it)
+FRAME_SOURCES = {
+    ("results", "results"): ("results", "weekend-feed"),
+    ("results", "stage_1"): ("stage_1_results", "weekend-feed"),
+    ("results", "stage_2"): ("stage_2_results", "weekend-feed"),
+    ("results", "stage_3"): ("stage_3_results", "weekend-feed"),
+    ("results", "cautions"): ("cautions", "weekend-feed"),
+    ("results", "lead_changes"): ("lead_changes", "weekend-feed"),
+    ("results", "practice"): ("practice", "weekend-feed"),
+    ("results", "qualifying"): ("qualifying", "weekend-feed"),
+    ("telemetry", "lap_times"): ("laps", "lap-times"),
+    ("telemetry", "pit_stops"): ("pit_stops", "live-pit-data"),
+    ("telemetry", "events"): ("events", "lap-notes"),
+    ("driver_data", "drivers"): ("driver_stats", "loopstats"),
+    ("driver_data", "driver_stats_advanced"): ("driver_stats_advanced", "live-feed"),
+}
+KEY_ENDPOINTS = {key: endpoint for key, endpoint in FRAME_SOURCES.values()}
+
+def endpoint_stamp(endpoint: str, payload=None) -> dict:
+    """ Versions (and source payload hash) stored in the manifest with what `endpoint` wrote """
+    stamp = {"processor_version": PROCESSOR_VERSION,
+             "schema_version": schema_version(k for k, src in FRAME_SOURCES.values() if src == endpoint)}
+    if payload is not None:
+        stamp["payload_sha256"] = payload_digest(payload)
+    return stamp
+
+def _stamp_current(entry: dict, endpoint: str) -> bool:
+    """ False when `entry` (a manifest endpoint) was derived by another processor or schema version """
+    current = endpoint_stamp(endpoint)
+    # Entries written before the stamps existed count as version 1 of the current schemas
+    return (entry.get("processor_version", 1) == current["processor_version"]
+            and entry.get("schema_version", current["schema_version"]) == current["schema_version"])
+
+def _lookup(df: pd.DataFrame, key: str, value: str) -> Dict:
+    """
+    {key: value} from the first row of each key. Plain python keys, because mapping a
+    categorical column through a categorical index goes by codes instead of labels.
+    """
+    pairs = df[[key, value]].dropna(subset=[key]).drop_duplicates(key)
+    return dict(zip(pairs[key].astype(object), pairs[value].astype(object)))
 
 
 class Race:
-    def __init__(self, year, series_id,race_id=None,live=False,reload = False,api_client = None):
-        self.metadata = RaceMetadata(race_id=race_id, year=year, series_id=series_id)
+    """
+    Race weekend data. Frames on race.results, race.telemetry and race.driver_data are lazy,
+    each one is read from cache (or fetched) the first time it is used.
+    Pass prefetch=True (or call race.prefetch()) to load everything up front.
+
+    Loading is cache first: endpoints recorded in the race manifest are never requested again,
+    so a fully cached race makes no network calls. cache_only=True never touches the network.
+    Endpoints cached by another processor/schema version are stale and re-derived, from the stored
+    raw payload when there is one (no network) and otherwise by fetching them again.
+    With set_options(raw_cache_enabled=True) every payload is stored, see reprocess().
+    """
+    def __init__(self, year, series_id,race_id=None,live=False,reload = False,api_client = None, prefetch=False,
+                 cache_only=False):
+        self._setup(year, series_id, race_id, live, reload, api_client, cache_only)
+
+        if prefetch:
+            self.prefetch()
+
+    def _setup(self, year, series_id, race_id, live, reload, api_client, cache_only=False) -> None:
+        self._metadata = RaceMetadata(race_id=race_id, year=year, series_id=series_id)
         self.api = api_client or NascarAPI()
         self.data_processor = NASCARDataProcessor()
-        self.results = RaceResults()
-        self.telemetry = RaceTelemetry()
-        self.driver_data = RaceDriverData()
+        self.results = RaceResults(loader=partial(self._load_frame, "results"))
+        self.telemetry = RaceTelemetry(loader=partial(self._load_frame, "telemetry"))
+        self.driver_data = RaceDriverData(loader=partial(self._load_frame, "driver_data"))
         self.reload = reload
         self.live = live
-
-        # Initialize the race data
-        self._load_race_data()
-
-    def _load_race_data(self) -> None:
-        self._load_results()
-        self._load_telemetry()
-        self._load_drivers()
-
-    def _load_results(self):
-        if (not self.live) and (not self.reload):
-            print(f"Reading from Cache for {self.metadata.year}-{self.metadata.series_id}-{self.metadata.race_id}")
-
-            cached_results = load_df("results", year=self.metadata.year, series_id=self.metadata.series_id, race_id=self.metadata.race_id)
-            cached_cautions = load_df("cautions", year=self.metadata.year, series_id=self.metadata.series_id, race_id=self.metadata.race_id)
-            cached_lead_changes = load_df("lead_changes", year=self.metadata.year, series_id=self.metadata.series_id, race_id=self.metadata.race_id)
-            cached_stage1 = load_df("stage_1_results", year=self.metadata.year, series_id=self.metadata.series_id, race_id=self.metadata.race_id)
-            cached_stage2 = load_df("stage_2_results", year=self.metadata.year, series_id=self.metadata.series_id, race_id=self.metadata.race_id)
-            cached_stage3 = load_df("stage_3_results", year=self.metadata.year, series_id=self.metadata.series_id, race_id=self.metadata.race_id)
-
-            if cached_results is not None:
-                self.results.results = cached_results
-                self.results.stage_1 = cached_stage1 if cached_stage1 is not None else pd.DataFrame()
-                self.results.stage_2 = cached_stage2 if cached_stage2 is not None else pd.DataFrame()
-                self.results.stage_3 = cached_stage3 if cached_stage3 is not None else pd.DataFrame()
-                self.results.cautions = cached_cautions if cached_cautions is not None else pd.DataFrame()
-                self.results.lead_changes = cached_lead_changes if cached_lead_changes is not None else pd.DataFrame()
-                self.metadata.winner = self._get_winner_name()
-        
-        print(f"Fetching Data for {self.metadata.year}-{self.metadata.series_id}-{self.metadata.race_id}")
-        race_data = self.api.get_race_data(year = self.metadata.year, series_id = self.metadata.series_id,
-                                           race_id=self.metadata.race_id, live=self.live)
+        self.cache_only = cache_only
+        self._fetched = set()
+        self._saved = {}
+        self._manifest = None
+        self._processors = {
+            "weekend-feed": self._process_weekend_feed,
+            "lap-times": self._process_lap_times,
+            "live-pit-data": self._process_pit_stops,
+            "lap-notes": self._process_event_notes,
+            "loopstats": self._process_driver_stats,
+            "live-feed": self._process_adv_driver_stats,
+        }
+
+    @property
+    def metadata(self) -> RaceMetadata:
+        """ Race metadata. Name, distance etc come from the manifest or the weekend feed on first use """
+        if "weekend-feed" not in self._fetched:
+            stale = self._endpoint_stale("weekend-feed")
+            if stale and self._rederive("weekend-feed"):
+                return self._metadata
+            cached = self._cached_manifest().get("metadata") if self._use_cache else None
+            if cached:
+                for f in fields(RaceMetadata):
+                    if f.name in cached and f.name not in ("race_id", "year", "series_id"):
+                        setattr(self._metadata, f.name, cached[f.name])
+                # A stale feed still has to be loaded (or refetched) for its frames
+                if not stale:
+                    self._fetched.add("weekend-feed")
+            elif not self.cache_only:
+                self._fetch_endpoint("weekend-feed")
+        return self._metadata
+
+    @property
+    def _use_cache(self) -> bool:
+        return (not self.live) and (not self.reload)
+
+    @classmethod
+    async def aload(cls, year, series_id, race_id=None, live=False, reload=False, api_client=None) -> "Race":
+        """
+        Async version of Race(..., prefetch=True). Every endpoint the race needs is requested at the same time,
+        then the responses are processed in the usual order (results first, everything else maps onto them).
+        api_client may be an AsyncNascarAPI or a NascarAPI, which will be wrapped.
+        """
+        if isinstance(api_client, AsyncNascarAPI):
+            async_api = api_client
+        else:
+            async_api = AsyncNascarAPI(client=api_client or NascarAPI())
+
+        race = cls.__new__(cls)
+        race._setup(year, series_id, race_id, live, reload, async_api.client)
+
+        endpoints = race._endpoints_to_fetch()
+        if endpoints:
+            print(f"Fetching Data for {year}-{series_id}-{race_id}")
+            payloads = await async_api.gather_race_endpoints(endpoints, year, series_id, race_id, live)
+            for endpoint in RACE_ENDPOINTS:
+                if endpoint in payloads:
+                    race._run_processor(endpoint, payloads[endpoint])
+        return race.prefetch()
+
+    def prefetch(self) -> "Race":
+        """ Load every frame now (the old eager behaviour). Returns self """
+        if self._use_cache:
+            # One batched read for everything cached (a single open in bundle format)
+            pending = {key: (c, f) for (c, f), (key, _) in FRAME_SOURCES.items() if not getattr(self, c).is_loaded(f)}
+            manifest = self._cached_manifest()
+            if manifest:
+                written = manifest.get("frames", {})
+                # Stale frames are left to _load_frame, which re-derives them
+                pending = {k: v for k, v in pending.items() if not self._endpoint_stale(KEY_ENDPOINTS[k])
+                           and (k in written or not self._endpoint_cached(KEY_ENDPOINTS[k]))}
+            cached = load_dfs(list(pending), year=self._metadata.year, series_id=self._metadata.series_id,
+                              race_id=self._metadata.race_id)
+            for key, df in cached.items():
+                container, frame = pending[key]
+                setattr(getattr(self, container), frame, df)
+            if "results" in cached:
+                self._metadata.winner = self._get_winner_name()
+        for container, frame in FRAME_SOURCES:
+            getattr(getattr(self, container), frame)
+        return self
+
+    def _cached_manifest(self) -> dict:
+        if self._manifest is None:
+            self._manifest = load_manifest(year=self._metadata.year, series_id=self._metadata.series_id,
+                                           race_id=self._metadata.race_id) or {}
+        return self._manifest
+
+    def _endpoint_cached(self, endpoint: str) -> bool:
+        return (self._use_cache and endpoint in self._cached_manifest().get("endpoints", {})
+                and not self._endpoint_stale(endpoint))
+
+    def _endpoint_stale(self, endpoint: str) -> bool:
+        """ Cached, but by another processor/schema version (see endpoint_stamp) """
+        if not self._use_cache:
+            return False
+        entry = self._cached_manifest().get("endpoints", {}).get(endpoint)
+        return entry is not None and not _stamp_current(entry, endpoint)
+
+    def _stored_payload(self, endpoint: str):
+        """
+        Raw payload the cached frames of `endpoint` were derived from, if it is still stored (raw payload
+        store first, then the http cache). None otherwise
+        """
+        payload = load_raw_payload(endpoint, year=self._metadata.year, series_id=self._metadata.series_id,
+                                   race_id=self._metadata.race_id)
+        if payload is None:
+            cached = load_http_response(self.api.race_endpoint_url(endpoint, self._metadata.year,
+                                                                   self._metadata.series_id, self._metadata.race_id))
+            if cached is None:
+                return None
+            try:
+                payload = json.loads(cached[0])
+            except ValueError:
+                return None
+        digest = self._cached_manifest().get("endpoints", {}).get(endpoint, {}).get("payload_sha256")
+        if digest is not None and payload_digest(payload) != digest:
+            return None
+        return payload
+
+    def _rederive(self, endpoint: str) -> bool:
+        """ Re-run the processor of a stale endpoint over its stored payload. False when there is none """
+        payload = self._stored_payload(endpoint)
+        if payload is None:
+            return False
+        print(f"Re-deriving {endpoint} for {self._metadata.year}-{self._metadata.series_id}-{self._metadata.race_id}")
+        self._run_processor(endpoint, payload, stored=True)
+        return True
+
+    def reprocess(self) -> list:
+        """
+        Run the processors again over the stored payloads (weekend feed first, the rest maps onto it) and
+        rewrite the cached frames, without any network. Endpoints with nothing stored keep their frames.
+        Returns the endpoints that were reprocessed.
+        """
+        done = []
+        for endpoint in RACE_ENDPOINTS:
+            payload = self._stored_payload(endpoint)
+            if payload is not None:
+                self._run_processor(endpoint, payload, stored=True)
+                done.append(endpoint)
+        return done
+
+    def is_cached(self) -> bool:
+        """ True when every endpoint of this race is recorded in the cache manifest """
+        return all(self._endpoint_cached(e) for e in RACE_ENDPOINTS)
+
+    def _endpoints_to_fetch(self) -> list:
+        """ Endpoints that a full load would hit the network for """
+        if not self._use_cache:
+            return list(RACE_ENDPOINTS)
+        if self.cache_only:
+            return []
+        endpoints = []
+        for endpoint in RACE_ENDPOINTS:
+            if self._endpoint_cached(endpoint):
+                continue
+            if self._endpoint_stale(endpoint):
+                # Re-derived offline by prefetch when the payload is stored
+                if self._stored_payload(endpoint) is None:
+                    endpoints.append(endpoint)
+                continue
+            keys = [key for key, src in FRAME_SOURCES.values() if src == endpoint]
+            # Caches written before manifests existed: a complete set of files counts, except for the
+            # weekend feed which is the only source of the metadata
+            if endpoint != "weekend-feed" and all(has_df(key, year=self._metadata.year, series_id=self._metadata.series_id,
+                                                         race_id=self._metadata.race_id) for key in keys):
+                continue
+            endpoints.append(endpoint)
+        return endpoints
+
+    def _load_frame(self, container: str, frame: str) -> None:
+        """
+        Loader behind the lazy containers: cache first (unless live/reload), otherwise fetch the endpoint once.
+        A frame missing from a cached endpoint is known to be empty and is not refetched.
+        Stale frames are re-derived (see _rederive), with cache_only they are served as they are when that is not possible.
+        """
+        key, endpoint = FRAME_SOURCES[(container, frame)]
+        stale = self._endpoint_stale(endpoint)
+        if self._use_cache and not stale:
+            if self._endpoint_cached(endpoint) and key not in self._cached_manifest().get("frames", {}):
+                return
+            cached = load_df(key, year=self._metadata.year, series_id=self._metadata.series_id, race_id=self._metadata.race_id)
+            if cached is not None:
+                setattr(getattr(self, container), frame, cached)
+                if key == "results":
+                    self._metadata.winner = self._get_winner_name()
+                return
+        if stale and endpoint not in self._fetched and self._rederive(endpoint):
+            return
+        if self.cache_only:
+            if stale:
+                cached = load_df(key, year=self._metadata.year, series_id=self._metadata.series_id,
+                                 race_id=self._metadata.race_id)
+                if cached is not None:
+                    setattr(getattr(self, container), frame, cached)
+                    if key == "results":
+                        self._metadata.winner = self._get_winner_name()
+            return
+        if endpoint not in self._fetched:
+            self._fetch_endpoint(endpoint)
+
+    def _fetch_endpoint(self, endpoint: str) -> None:
+        print(f"Fetching {endpoint} for {self._metadata.year}-{self._metadata.series_id}-{self._metadata.race_id}")
+        payload = self.api.get_race_endpoint(endpoint, self._metadata.year, self._metadata.series_id,
+                                             self._metadata.race_id, self.live)
+        self._run_processor(endpoint, payload)
+
+    def _run_processor(self, endpoint: str, payload, stored: bool = False) -> None:
+        """ Process a payload and record in the manifest what it wrote. stored: the payload was read from disk """
+        self._fetched.add(endpoint)
+        self._processors[endpoint](payload)
+        # Re-apply the schemas after the names/ids were mapped on
+        for (container, frame), (key, src) in FRAME_SOURCES.items():
+            if src == endpoint and getattr(self, container).is_loaded(frame):
+                apply_schema(getattr(getattr(self, container), frame), key)
+        saved = self._saved.pop(endpoint, {})
+        if saved:
+            save_dfs(saved, year=self._metadata.year, series_id=self._metadata.series_id, race_id=self._metadata.race_id)
+        if payload and not self.live:
+            if not stored:
+                save_raw_payload(endpoint, payload, year=self._metadata.year, series_id=self._metadata.series_id,
+                                 race_id=self._metadata.race_id)
+            metadata = asdict(self._metadata) if endpoint == "weekend-feed" else None
+            rows = {key: len(df) for key, df in saved.items()}
+            self._manifest = record_race_endpoint(endpoint, rows, year=self._metadata.year, series_id=self._metadata.series_id,
+                                                  race_id=self._metadata.race_id, metadata=metadata,
+                                                  stamp=endpoint_stamp(endpoint, payload))
+
+    def _save(self, key: str, df: pd.DataFrame) -> None:
+        # Written once per endpoint by _run_processor, so a bundle is rewritten once and not per table
+        self._saved.setdefault(KEY_ENDPOINTS[key], {})[key] = df
+
+    def _process_weekend_feed(self, race_data: Optional[Dict]) -> None:
         if not race_data:
-            print(f"Failed to fetch race data for: {self.metadata.year}-{self.metadata.series_id}-{self.metadata.race_id}")
+            print(f"Failed to fetch race data for: {self._metadata.year}-{self._metadata.series_id}-{self._metadata.race_id}")
             return
         
         weekend_race = race_data.get('weekend_race', [])
@@ -114,41 +401,41 @@ class Race:
         
     
     def _update_metadata(self, weekend_data: Dict) -> None:
-        self.metadata.name = weekend_data.get('race_name')
-        self.metadata.distance = weekend_data.get('scheduled_distance')
-        self.metadata.scheduled_laps = weekend_data.get('scheduled_laps')
-        self.metadata.race_time = weekend_data.get('total_race_time')
-        self.metadata.stage_1_laps = weekend_data.get('stage_1_laps')
-        self.metadata.stage_2_laps = weekend_data.get('stage_2_laps')
-        self.metadata.stage_3_laps = weekend_data.get('stage_3_laps')
-        self.metadata.entrant_num = weekend_data.get('number_of_cars_in_field')
-        self.metadata.restrictor_plate = weekend_data.get('restrictor_plate')
+        self._metadata.name = weekend_data.get('race_name')
+        self._metadata.distance = weekend_data.get('scheduled_distance')
+        self._metadata.scheduled_laps = weekend_data.get('scheduled_laps')
+        self._metadata.race_time = weekend_data.get('total_race_time')
+        self._metadata.stage_1_laps = weekend_data.get('stage_1_laps')
+        self._metadata.stage_2_laps = weekend_data.get('stage_2_laps')
+        self._metadata.stage_3_laps = weekend_data.get('stage_3_laps')
+        self._metadata.entrant_num = weekend_data.get('number_of_cars_in_field')
+        self._metadata.restrictor_plate = weekend_data.get('restrictor_plate')
 
     def _process_race_results(self,race_data:Dict) -> None:
         self.results.results = self.data_processor.process_race_data(race_data)
-        self.results.results['driver_name'] = self.results.results['driver_name'].map(normalize_name)
+        self.results.results['driver_name'] = normalize_names(self.results.results['driver_name'])
         self.results.cautions = self.data_processor.process_caution_data(race_data)
         self.results.lead_changes = self.data_processor.process_leader_data(race_data)
         if not self.results.lead_changes.empty:
-            self.results.lead_changes['driver_name'] = self.results.lead_changes['car_number'].map(self.results.results.set_index('car_number')['driver_name'])
-        self.metadata.winner = self._get_winner_name()
+            self.results.lead_changes['driver_name'] = self.results.lead_changes['car_number'].map(_lookup(self.results.results, 'car_number', 'driver_name'))
+        self._metadata.winner = self._get_winner_name()
         stages_data = race_data.get('stage_results', [])
         for stage_data in stages_data:
             stage_num = stage_data.get('stage_number')
             if stage_num in [1, 2, 3]:
                 stage_df = self.data_processor.process_stage_data(stage_data, stage_num)
-                stage_df['driver_name'] = stage_df['driver_name'].map(normalize_name)
+                stage_df['driver_name'] = normalize_names(stage_df['driver_name'])
                 setattr(self.results, f"stage_{stage_num}", stage_df)
 
         if not self.live:
-            save_df("results", self.results.results, year=self.metadata.year, series_id=self.metadata.series_id, race_id=self.metadata.race_id)
-            save_df("cautions", self.results.cautions, year=self.metadata.year, series_id=self.metadata.series_id, race_id=self.metadata.race_id)
-            save_df("lead_changes", self.results.lead_changes, year=self.metadata.year, series_id=self.metadata.series_id, race_id=self.metadata.race_id)
-            save_df('stage_1_results', self.results.stage_1, year=self.metadata.year, series_id=self.metadata.series_id, race_id=self.metadata.race_id)
-            save_df('stage_2_results', self.results.stage_2, year=self.metadata.year, series_id=self.metadata.series_id, race_id=self.metadata.race_id)
+            self._save("results", self.results.results)
+            self._save("cautions", self.results.cautions)
+            self._save("lead_changes", self.results.lead_changes)
+            self._save('stage_1_results', self.results.stage_1)
+            self._save('stage_2_results', self.results.stage_2)
             # Disabled because most races don't have a stage 3 in data. Only Charlotte which normally has 4
             # if self.results.stage_3 is not None:
-            #     save_df('stage_3_results', self.results.stage_3, year=self.metadata.year, series_id=self.metadata.series_id, race_id=self.metadata.race_id)
+            #     self._save('stage_3_results', self.results.stage_3)
 
     def _get_winner_name(self) -> str:
         """Get the name of the race winner."""
@@ -162,103 +449,51 @@ class Race:
         self.results.practice = practice
         if not self.live:
             if not self.results.practice.empty:
-                save_df("practice",  self.results.practice, year=self.metadata.year, series_id=self.metadata.series_id, race_id=self.metadata.race_id)
+                self._save("practice", self.results.practice)
             if not self.results.qualifying.empty:
-                save_df("qualifying", self.results.qualifying, year=self.metadata.year, series_id=self.metadata.series_id, race_id=self.metadata.race_id)
+                self._save("qualifying", self.results.qualifying)
 
-    def _load_telemetry(self):
-        if (not self.live) and (not self.reload):
-            cached_laps = load_df("laps", year=self.metadata.year, series_id=self.metadata.series_id, race_id=self.metadata.race_id)
-            self.telemetry.lap_times = cached_laps if cached_laps is not None else pd.DataFrame()
-        else:
-            self._fetch_lap_times()
-
-        if (not self.live) and (not self.reload):
-            cached_pit_stops = load_df("pit_stops", year=self.metadata.year, series_id=self.metadata.series_id, race_id=self.metadata.race_id)
-            self.telemetry.pit_stops = cached_pit_stops if cached_pit_stops is not None else pd.DataFrame()
-        else:
-            self._fetch_pit_stops()
-        
-        if (not self.live) and (not self.reload):
-            cached_events = load_df("events", year=self.metadata.year, series_id=self.metadata.series_id, race_id=self.metadata.race_id)
-            self.telemetry.events = cached_events if cached_events is not None else pd.DataFrame()
-        else:
-            self._fetch_event_notes()
-
-    def _fetch_lap_times(self):
-        """Fetch lap times for the specified race ID."""
-        lap_data = self.api.get_lap_time_data(year=self.metadata.year, series_id=self.metadata.series_id,
-                                              race_id=self.metadata.race_id, live=self.live)
+    def _process_lap_times(self, lap_data: Optional[Dict]) -> None:
         if lap_data:
             self.telemetry.lap_times = self.data_processor.process_laps_data(lap_data)
 
             clean_res = self.results.results[['driver_name', 'driver_id','car_number']].copy()
-            clean_res['driver_name'] = clean_res['driver_name'].map(normalize_name)
-            name_to_id = clean_res[['driver_name', 'driver_id']].drop_duplicates("driver_name").set_index("driver_name")["driver_id"]
+            clean_res['driver_name'] = normalize_names(clean_res['driver_name'])
+            name_to_id = _lookup(clean_res, 'driver_name', 'driver_id')
 
-            self.telemetry.lap_times['driver_name'] = self.telemetry.lap_times['driver_name'].map(normalize_name)
-            self.telemetry.lap_times['driver_id'] = self.telemetry.lap_times['driver_name'].map(name_to_id)
+            self.telemetry.lap_times['driver_name'] = normalize_names(self.telemetry.lap_times['driver_name'])
+            # driver_name is categorical so this maps once per driver, keep the ids numeric like the other tables
+            self.telemetry.lap_times['driver_id'] = self.telemetry.lap_times['driver_name'].map(name_to_id).astype('Int64')
 
         if not self.live:
-            save_df("laps", self.telemetry.lap_times, year=self.metadata.year, series_id=self.metadata.series_id, race_id=self.metadata.race_id)
+            self._save("laps", self.telemetry.lap_times)
     
-    def _fetch_pit_stops(self):
-        pit_data = self.api.get_pit_stop_data(
-            self.metadata.year,
-            self.metadata.series_id,
-            self.metadata.race_id,
-            self.live
-        )
+    def _process_pit_stops(self, pit_data) -> None:
         if pit_data:
             self.telemetry.pit_stops = self.data_processor.process_pit_stops(pit_data)
-            self.telemetry.pit_stops['driver_name'] = self.telemetry.pit_stops['driver_name'].map(normalize_name)
+            self.telemetry.pit_stops['driver_name'] = normalize_names(self.telemetry.pit_stops['driver_name'])
 
             clean_res = self.results.results[['driver_name', 'driver_id','car_number']].copy()
-            clean_res['driver_name'] = clean_res['driver_name'].map(normalize_name)
-            name_to_id = clean_res[['driver_name', 'driver_id']].drop_duplicates("driver_name").set_index("driver_name")["driver_id"]
-            name_to_num = clean_res[['driver_name', 'car_number']].drop_duplicates("driver_name").set_index("driver_name")["car_number"]
+            clean_res['driver_name'] = normalize_names(clean_res['driver_name'])
+            name_to_id = _lookup(clean_res, 'driver_name', 'driver_id')
+            name_to_num = _lookup(clean_res, 'driver_name', 'car_number')
 
-            self.telemetry.pit_stops['driver_id'] = self.telemetry.pit_stops['driver_name'].map(name_to_id)
+            self.telemetry.pit_stops['driver_id'] = self.telemetry.pit_stops['driver_name'].map(name_to_id).astype('Int64')
             self.telemetry.pit_stops['car_number'] = self.telemetry.pit_stops['driver_name'].map(name_to_num)
 
         if not self.live:
-            save_df("pit_stops", self.telemetry.pit_stops, year=self.metadata.year, series_id=self.metadata.series_id, race_id=self.metadata.race_id)
-
-    def _fetch_event_notes(self):
-        """ Fetch lap events and flags"""
-        event_data = self.api.get_event_notes_data(
-            self.metadata.year,
-            self.metadata.series_id,
-            self.metadata.race_id,
-            self.live
-        )
+            self._save("pit_stops", self.telemetry.pit_stops)
+
+    def _process_event_notes(self, event_data: Optional[Dict]) -> None:
         if event_data:
             self.telemetry.events = self.data_processor.process_event_notes_data(event_data)
 
         if not self.live:
-            save_df("events", self.telemetry.events, year=self.metadata.year, series_id=self.metadata.series_id, race_id=self.metadata.race_id)
+            self._save("events", self.telemetry.events)
 
-    def _load_drivers(self):
-        if (not self.live) and (not self.reload):
-            cached_driver_stats = load_df("driver_stats", year=self.metadata.year, series_id=self.metadata.series_id, race_id=self.metadata.race_id)
-            self.driver_data.drivers = cached_driver_stats if cached_driver_stats is not None else pd.DataFrame()
-        else:
-            self._fetch_driver_stats()
-
-        if (not self.live) and (not self.reload):
-            cached_driver_stats_advanced = load_df("driver_stats_advanced", year=self.metadata.year, series_id=self.metadata.series_id, race_id=self.metadata.race_id)
-            self.driver_data.driver_stats_advanced = cached_driver_stats_advanced if cached_driver_stats_advanced is not None else pd.DataFrame()
-        else:
-            self._fetch_adv_driver_stats()
-
-    def _fetch_driver_stats(self):
-        driver_stats_data = self.api.get_driver_stat_data(
-            self.metadata.year,
-            self.metadata.series_id,
-            self.metadata.race_id,
-        )
-        
-        self.driver_data.drivers = self.data_processor.process_driver_data(driver_stats_data)
+    def _process_driver_stats(self, driver_stats_data) -> None:
+        if driver_stats_data:
+            self.driver_data.drivers = self.data_processor.process_driver_data(driver_stats_data)
 
         if not self.driver_data.drivers.empty:
             name_map_df = (
@@ -270,18 +505,13 @@ class Race:
             name_map = name_map_df.set_index('driver_id')['driver_name']
             self.driver_data.drivers['driver_name'] = self.driver_data.drivers['driver_id'].astype('Int64').map(name_map)
         if not self.live:
-                save_df("driver_stats", self.driver_data.drivers, year=self.metadata.year, series_id=self.metadata.series_id, race_id=self.metadata.race_id)
+                self._save("driver_stats", self.driver_data.drivers)
     
-    def _fetch_adv_driver_stats(self):
-        adv_driver_stats_data = self.api.get_advanced_driver_stat_data(
-            self.metadata.year,
-            self.metadata.series_id,
-            self.metadata.race_id,
-        )
-        self.driver_data.driver_stats_advanced = self.data_processor.process_adv_driver_data(adv_driver_stats_data)
-
-        self.driver_data.driver_stats_advanced['driver_name'] = self.driver_data.driver_stats_advanced['driver_name'].map(normalize_name)
+    def _process_adv_driver_stats(self, adv_driver_stats_data) -> None:
+        if adv_driver_stats_data:
+            self.driver_data.driver_stats_advanced = self.data_processor.process_adv_driver_data(adv_driver_stats_data)
+            self.driver_data.driver_stats_advanced['driver_name'] = normalize_names(self.driver_data.driver_stats_advanced['driver_name'])
 
 
         if not self.live:
-            save_df("driver_stats_advanced", self.driver_data.driver_stats_advanced, year=self.metadata.year, series_id=self.metadata.series_id, race_id=self.metadata.race_id)
\ No newline at end of file
+            self._save("driver_stats_advanced", self.driver_data.driver_stats_advanced)
\ No newline at end of file
@@ -0,0 +1,63 @@
+from __future__ import annotations
+from typing import Dict, List, Optional, Tuple
+import os
+
+from .caching import list_cached_races, list_raw_races
+from .core.base_api import NascarAPI
+from .race import Race
+from .utils import as_int_set
+from .workers import process_pool, task_done, worker_api
+
+# Processed frames derived again from the stored payloads (raw payload store, see set_options(raw_cache_enabled=True),
+# or the http cache) instead of downloading them. Nothing here touches the network.
+
+
+def reprocess(year: int, series_id: int, race_id: int, api_client: Optional[NascarAPI] = None) -> List[str]:
+    """
+    Rewrite the cached frames of one race from its stored payloads, see Race.reprocess.
+    Returns the endpoints that were reprocessed (empty when nothing is stored).
+    api_client is only used to find responses in the http cache, no request is made.
+    """
+    race = Race(year, series_id, race_id, api_client=api_client, cache_only=True)
+    return race.reprocess()
+
+
+def _reprocess_race(key: Tuple[int, int, int], api: Optional[NascarAPI] = None) -> List[str]:
+    try:
+        return reprocess(*key, api_client=api or worker_api())
+    except Exception as e:
+        print(f"Error reprocessing race {key[0]}-{key[1]}-{key[2]}: {e}")
+        return []
+    finally:
+        task_done()
+
+
+def reprocess_races(
+    years=None,
+    series_ids=None,
+    race_ids=None,
+    workers: Optional[int] = None,
+    api_client: Optional[NascarAPI] = None
+) -> Dict[Tuple[int, int, int], List[str]]:
+    """
+    reprocess() every race that is cached or has stored raw payloads, optionally only some
+    years/series_ids/race_ids (a value or a list of values).
+    Races are independent so they are spread over `workers` processes, one per CPU by default.
+    Returns {(year, series_id, race_id): endpoints reprocessed}.
+
+    e.g. after a change to NASCARDataProcessor:
+        set_options(raw_cache_enabled=True)   # when the races are first fetched
+        reprocess_races(years=range(2020, 2026))
+    """
+    years, series_ids, race_ids = as_int_set(years), as_int_set(series_ids), as_int_set(race_ids)
+    races = sorted({r for r in list_cached_races() + list_raw_races()
+                    if (years is None or r[0] in years) and (series_ids is None or r[1] in series_ids)
+                    and (race_ids is None or r[2] in race_ids)})
+    api = api_client or NascarAPI()
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    if workers > 1 and len(races) > 1:
+        with process_pool(min(workers, len(races)), api.config) as pool:
+            done = list(pool.map(_reprocess_race, races))
+    else:
+        done = [_reprocess_race(race, api) for race in races]
+    return dict(zip(races, done))
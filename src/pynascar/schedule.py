@@ -1,9 +1,9 @@
 # src/pynascar/schedule.py
 import warnings
 import pandas as pd
-import requests
 from .caching import load_schedule, save_schedule
 from .definitions import tracks_map
+from .core.base_api import NascarAPI
 
 # endpoint for race list
 #https://cf.nascar.com/cacher/2023/race_list_basic.json
@@ -18,12 +18,15 @@ class Schedule:
         
     '''
     
-    def __init__(self, year, series_id, use_cache=False):
+    def __init__(self, year, series_id, use_cache=False, api_client=None, cache_only=False):
         self.year = year
         self.series_id = series_id
         self.races = []
         self.data = pd.DataFrame()
         self.use_cache = use_cache
+        # Only the cached schedule, never the network
+        self.cache_only = cache_only
+        self.api = api_client or NascarAPI()
         self.fetch_races()      
 
     def fetch_races(self):
@@ -34,12 +37,12 @@ class Schedule:
                 self.data = cached_schedule
                 self.races = self.data.to_dict(orient="records")
                 return
+        if self.cache_only:
+            return
 
-        url = f"https://cf.nascar.com/cacher/{self.year}/race_list_basic.json"
-        response = requests.get(url)
-        if response.status_code == 200:
+        data = self.api.get_schedule(self.year)
+        if data:
             print(f"Fetching data for Year:{self.year} Series:{self.series_id}")
-            data = response.json()
             # Filter the races by series ID
             race_list = data[f'series_{self.series_id}']
             self.races = [race for race in race_list if race['series_id'] == self.series_id]
@@ -54,7 +57,7 @@ class Schedule:
             if self.use_cache:
                 save_schedule(self.data, year=self.year, series_id=self.series_id)
         else:
-            warnings.warn(f"Failed to fetch race list: {response.status_code}")
+            warnings.warn(f"Failed to fetch race list for {self.year}")
     
     def completed_races(self):
         """Return a list of completed races."""
@@ -1,10 +1,21 @@
 import re
 import os
 import warnings
+from functools import lru_cache
+import pandas as pd
+from .codes import NAME_MAPPINGS
 
 # src/utils.py
 # Utility functions for NASCAR data processing
 # Can add regex patterns for validation or other utility functions as needed
+def as_int_set(values):
+    """ None, a value or an iterable of values as a set of ints (None stays None) """
+    if values is None:
+        return None
+    if isinstance(values, (int, str)):
+        values = [values]
+    return {int(v) for v in values}
+
 def get_series_id(name):
     match name:
         case 'Cup Series':
@@ -32,27 +43,32 @@ def get_series_name(series_id):
 
 
 # Build name map from results, stripping symbols for matching
+_LEADING_SYMBOLS = re.compile(r'^[*#†‡§¶\s]+')
+_TRAILING_SYMBOLS = re.compile(r'[*#†‡§¶\s]+$')
+_TRAILING_PARENS = re.compile(r'\s*\([^)]*\)\s*$')
+
 def _clean_name(name):
     if name is None:
         return None
     
     cleaned = str(name).strip()
-    cleaned = re.sub(r'^[*#†‡§¶\s]+', '', cleaned)
-    cleaned = re.sub(r'[*#†‡§¶\s]+$', '', cleaned)
-    cleaned = re.sub(r'\s*\([^)]*\)\s*$', '', cleaned)
+    cleaned = _LEADING_SYMBOLS.sub('', cleaned)
+    cleaned = _TRAILING_SYMBOLS.sub('', cleaned)
+    cleaned = _TRAILING_PARENS.sub('', cleaned)
     return cleaned.strip()
 
-name_mappings = {
-    "Daniel Suárez": "Daniel Suarez",
-    "John H. Nemechek": "John Hunter Nemechek",
-    "Ricky Stenhouse Jr": "Ricky Stenhouse Jr.",
-    "Martin Truex Jr": "Martin Truex Jr.",
-    "Dale Earnhardt Jr": "Dale Earnhardt Jr."
-    
-}
+# Kept for backwards compatibility, the table lives in codes
+name_mappings = NAME_MAPPINGS
 
+@lru_cache(maxsize=4096)
 def normalize_name(name):
     cleaned = _clean_name(name)
-    if cleaned in name_mappings:
-        return name_mappings[cleaned]
-    return cleaned
+    return NAME_MAPPINGS.get(cleaned, cleaned)
+
+def normalize_names(names: pd.Series) -> pd.Series:
+    """
+    normalize_name over a column, run once per distinct name instead of once per row.
+    Categorical columns only map their categories. Missing values stay missing.
+    """
+    lookup = {name: normalize_name(name) for name in names.dropna().unique()}
+    return names.map(lookup)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from typing import Optional
+import multiprocessing
+
+from .caching import flush_ledgers
+from .config import get_settings, set_options
+from .core.base_api import NascarAPI, NASCARConfig
+
+# Process pool workers (DriversData.build(workers=...), reprocess_races) run with the settings of the
+# parent process and a client of their own, created once per process by init_worker.
+# They are started with spawn rather than fork: the parent may have other threads (CareerData seasons,
+# the caller's own) and a forked child inherits the cache locks (memory tier, ledger, index) in whatever
+# state those threads left them, possibly held forever.
+
+_api: Optional[NascarAPI] = None
+
+
+def init_worker(settings, config: NASCARConfig) -> None:
+    """ ProcessPoolExecutor initializer """
+    global _api
+    set_options(**asdict(settings))
+    _api = NascarAPI(config)
+
+
+def process_pool(workers: int, config: NASCARConfig) -> ProcessPoolExecutor:
+    """ Pool of `workers` spawned processes set up by init_worker with the current settings and `config` """
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=init_worker, initargs=(get_settings(), config))
+
+
+def worker_api() -> Optional[NascarAPI]:
+    """ Client of this worker process, None outside of one """
+    return _api
+
+
+def task_done() -> None:
+    """
+    Call at the end of every worker task. Pool workers exit without running the exit hooks,
+    so the cache ledger is flushed here or its last updates are lost.
+    """
+    flush_ledgers()